@@ -0,0 +1,134 @@
+"""Пропускная способность страниц чтения: WSGI против ASGI.
+
+Каждый режим запускается в отдельном процессе (BLOGICUM_ASYNC_VIEWS
+читается при импорте urls), на тестовой базе в памяти:
+
+* wsgi — синхронные view, запросы из пула потоков;
+* asgi-sync — синхронные view за ASGI-обработчиком;
+* asgi-async — асинхронные view из blog.views_async.
+
+Запуск: python benchmarks/async_vs_wsgi.py --concurrency 20 --requests 400
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import setup_django
+
+MODES = {
+    'wsgi': '0',
+    'asgi-sync': '0',
+    'asgi-async': '1',
+}
+
+
+def seed(posts, comments):
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+
+    from blog.models import Category, Comment, Post
+
+    author = User.objects.create_user('bench', password='bench')
+    category = Category.objects.create(
+        title='Тест', description='Тест', slug='bench')
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(title=f'Пост {i}', text='Текст ' * 50, author=author,
+             category=category, pub_date=now - timezone.timedelta(hours=i),
+             visibility=Post.VISIBLE)
+        for i in range(posts)
+    )
+    post = Post.objects.order_by('-pub_date').first()
+    Comment.objects.bulk_create(
+        Comment(text=f'Комментарий {i}', post=post, author=author)
+        for i in range(comments)
+    )
+    Post.objects.recount_comments()
+    return [
+        '/', '/?page=2', f'/category/{category.slug}/',
+        f'/profile/{author.username}/', f'/posts/{post.pk}/',
+    ]
+
+
+def run_wsgi(urls, total, concurrency):
+    from django.test import Client
+
+    def worker(count):
+        client = Client()
+        for i in range(count):
+            client.get(urls[i % len(urls)])
+
+    per_worker = total // concurrency
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(worker, [per_worker] * concurrency))
+    return per_worker * concurrency
+
+
+def run_asgi(urls, total, concurrency):
+    from django.test import AsyncClient
+
+    async def worker(count):
+        client = AsyncClient()
+        for i in range(count):
+            await client.get(urls[i % len(urls)])
+
+    async def main():
+        per_worker = total // concurrency
+        await asyncio.gather(
+            *(worker(per_worker) for _ in range(concurrency)))
+        return per_worker * concurrency
+
+    return asyncio.run(main())
+
+
+def child(args):
+    setup_django()
+    urls = seed(args.posts, args.comments)
+    runner = run_wsgi if args.mode == 'wsgi' else run_asgi
+    # Прогрев: шаблоны и соединения.
+    runner(urls, len(urls), 1)
+    started = time.perf_counter()
+    done = runner(urls, args.requests, args.concurrency)
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        'mode': args.mode,
+        'requests': done,
+        'concurrency': args.concurrency,
+        'seconds': round(elapsed, 3),
+        'rps': round(done / elapsed, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mode', choices=MODES)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--posts', type=int, default=200)
+    parser.add_argument('--comments', type=int, default=100)
+    args = parser.parse_args()
+    if args.mode:
+        child(args)
+        return
+    results = []
+    for mode, async_views in MODES.items():
+        output = subprocess.run(
+            [sys.executable, __file__, '--mode', mode,
+             '--requests', str(args.requests),
+             '--concurrency', str(args.concurrency),
+             '--posts', str(args.posts),
+             '--comments', str(args.comments)],
+            env={**os.environ, 'BLOGICUM_ASYNC_VIEWS': async_views},
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""Загрузка фикстур: manage.py bulk_load против loaddata.
+
+Скрипт пишет фикстуру с --posts постами (и комментариями к ним) в двух
+форматах — массив JSON, как у dumpdata, и NDJSON (.jsonl) — и загружает
+каждую обеими командами в чистую базу SQLite. Каждая загрузка идёт в
+отдельном процессе, чтобы пиковая память (maxrss) относилась к ней одной.
+
+Запуск: python benchmarks/bulk_load_vs_loaddata.py --posts 20000
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import git_revision, setup_django
+
+LOADERS = ('loaddata', 'bulk_load')
+FORMATS = ('json', 'jsonl')
+N_USERS = 50
+N_CATEGORIES = 10
+N_LOCATIONS = 10
+TIMESTAMP = '2024-01-01T00:00:00Z'
+
+
+def fixture_objects(n_posts, comments_per_post):
+    """Объекты в порядке dumpdata; updated_at задан, как в свежем дампе."""
+    for pk in range(1, N_CATEGORIES + 1):
+        yield {'model': 'blog.category', 'pk': pk, 'fields': {
+            'title': f'Категория {pk}', 'description': 'Описание',
+            'slug': f'category-{pk}', 'is_published': True,
+            'created_at': TIMESTAMP,
+        }}
+    for pk in range(1, N_LOCATIONS + 1):
+        yield {'model': 'blog.location', 'pk': pk, 'fields': {
+            'name': f'Место {pk}', 'is_published': True,
+            'created_at': TIMESTAMP,
+        }}
+    for pk in range(1, N_USERS + 1):
+        yield {'model': 'auth.user', 'pk': pk, 'fields': {
+            'username': f'user{pk}', 'password': '!', 'is_active': True,
+            'date_joined': TIMESTAMP, 'groups': [], 'user_permissions': [],
+        }}
+    for pk in range(1, n_posts + 1):
+        yield {'model': 'blog.post', 'pk': pk, 'fields': {
+            'title': f'Пост {pk}', 'text': 'Текст публикации. ' * 20,
+            'pub_date': TIMESTAMP, 'is_published': True,
+            'created_at': TIMESTAMP, 'updated_at': TIMESTAMP,
+            'author': pk % N_USERS + 1,
+            'category': pk % N_CATEGORIES + 1,
+            'location': pk % N_LOCATIONS + 1 if pk % 3 else None,
+        }}
+    comment_pk = 0
+    for post_pk in range(1, n_posts + 1):
+        for j in range(comments_per_post):
+            comment_pk += 1
+            yield {'model': 'blog.comment', 'pk': comment_pk, 'fields': {
+                'text': f'Комментарий {j}', 'post': post_pk,
+                'author': (post_pk + j) % N_USERS + 1,
+                'created_at': TIMESTAMP,
+            }}
+
+
+def write_fixtures(data_dir, n_posts, comments_per_post):
+    base = data_dir / f'blogicum-fixture-{n_posts}-{comments_per_post}'
+    paths = {fmt: base.with_suffix(f'.{fmt}') for fmt in FORMATS}
+    with open(paths['json'], 'w', encoding='utf-8') as array, \
+            open(paths['jsonl'], 'w', encoding='utf-8') as lines:
+        array.write('[\n')
+        for index, obj in enumerate(
+                fixture_objects(n_posts, comments_per_post)):
+            line = json.dumps(obj, ensure_ascii=False)
+            array.write((',\n' if index else '') + line)
+            lines.write(line + '\n')
+        array.write('\n]\n')
+    return paths
+
+
+def child(args):
+    """Одна загрузка в свежую базу; печатает строку JSON с результатом."""
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(Path(directory) / 'bench.sqlite3')
+        from django.core.management import call_command
+
+        from blog.models import Comment, Post
+
+        started = time.perf_counter()
+        call_command(args.loader, args.fixture, verbosity=0)
+        elapsed = time.perf_counter() - started
+        print(json.dumps({
+            'loader': args.loader,
+            'format': Path(args.fixture).suffix[1:],
+            'seconds': round(elapsed, 2),
+            'max_rss_mb': round(
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            'posts': Post.objects.count(),
+            'comments': Comment.objects.count(),
+        }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=20_000)
+    parser.add_argument('--comments-per-post', type=int, default=3)
+    parser.add_argument(
+        '--data-dir', default=tempfile.gettempdir(),
+        help='Каталог для сгенерированных фикстур.')
+    parser.add_argument('--loader', choices=LOADERS, help=argparse.SUPPRESS)
+    parser.add_argument('--fixture', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.loader:
+        child(args)
+        return
+
+    data_dir = Path(args.data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    paths = write_fixtures(data_dir, args.posts, args.comments_per_post)
+    runs = []
+    for fmt, path in paths.items():
+        for loader in LOADERS:
+            output = subprocess.run(
+                [sys.executable, __file__, '--loader', loader,
+                 '--fixture', str(path)],
+                check=True, stdout=subprocess.PIPE, text=True,
+            ).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+    print(json.dumps({
+        'revision': git_revision(),
+        'posts': args.posts,
+        'comments': args.posts * args.comments_per_post,
+        'runs': runs,
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
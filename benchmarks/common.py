@@ -0,0 +1,50 @@
+"""Общая подготовка Django для скриптов бенчмарков."""
+import math
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup_django(database=None, page_cache=False):
+    """Настраивает Django; database — путь к отдельной базе SQLite.
+
+    Без database создаётся тестовая база в памяти. Кеш страниц по
+    умолчанию выключен: измеряется рендеринг, а не выдача из кеша.
+    """
+    sys.path.insert(0, str(ROOT / 'blogicum'))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+    import django
+    from django.conf import settings
+
+    django.setup()
+    settings.DEBUG = False
+    settings.PAGE_CACHE_ENABLED = page_cache
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    if database is None:
+        connection.creation.create_test_db(verbosity=0, keepdb=False)
+        return
+    from django.core.management import call_command
+
+    connection.settings_dict['NAME'] = str(database)
+    call_command('migrate', verbosity=0)
+
+
+def percentile(sorted_values, percent):
+    index = math.ceil(len(sorted_values) * percent / 100) - 1
+    return sorted_values[max(index, 0)]
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
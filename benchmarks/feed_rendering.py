@@ -0,0 +1,205 @@
+"""Скорость рендеринга лент и страницы поста на больших объёмах данных.
+
+Для каждого размера из --sizes создаётся (или берётся готовая) база SQLite
+с постами и комментариями, записанными через bulk_create. Затем тестовым
+клиентом Django измеряются запросы в секунду и перцентили задержки для
+главной, глубокой страницы ?page=, категории, профиля и страницы поста.
+Результаты печатаются в JSON (или пишутся в --output) вместе с ревизией
+git, чтобы сравнивать коммиты.
+
+Запуск: python benchmarks/feed_rendering.py --sizes 10000 100000 1000000
+"""
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import git_revision, percentile, setup_django
+
+BATCH_SIZE = 5000
+N_USERS = 100
+N_CATEGORIES = 20
+N_LOCATIONS = 20
+
+
+def _bulk(model, objects):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) == BATCH_SIZE:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+def seed(n_posts, comments_per_post):
+    from django.contrib.auth.models import User
+    from django.contrib.auth.hashers import make_password
+    from django.utils import timezone
+
+    from blog.models import Category, Comment, Location, Post
+
+    password = make_password(None)
+    User.objects.bulk_create(
+        User(username=f'user{i}', password=password) for i in range(N_USERS))
+    Category.objects.bulk_create(
+        Category(title=f'Категория {i}', description='Описание',
+                 slug=f'category-{i}')
+        for i in range(N_CATEGORIES)
+    )
+    Location.objects.bulk_create(
+        Location(name=f'Место {i}') for i in range(N_LOCATIONS))
+    user_ids = list(User.objects.values_list('pk', flat=True))
+    category_ids = list(Category.objects.values_list('pk', flat=True))
+    location_ids = list(Location.objects.values_list('pk', flat=True))
+
+    rng = random.Random(n_posts)
+    now = timezone.now()
+    _bulk(Post, (
+        Post(
+            title=f'Пост {i}',
+            text='Текст публикации. ' * rng.randint(5, 60),
+            pub_date=now - timezone.timedelta(minutes=i),
+            author_id=user_ids[i % N_USERS],
+            category_id=category_ids[i % N_CATEGORIES],
+            location_id=location_ids[i % N_LOCATIONS] if i % 3 else None,
+            comment_count=comments_per_post,
+            visibility=Post.VISIBLE,
+        )
+        for i in range(n_posts)
+    ))
+    first_post = Post.objects.order_by('pk').values_list(
+        'pk', flat=True).first()
+    _bulk(Comment, (
+        Comment(
+            text=f'Комментарий {j}',
+            post_id=first_post + i,
+            author_id=user_ids[(i + j) % N_USERS],
+        )
+        for i in range(n_posts)
+        for j in range(comments_per_post)
+    ))
+
+
+def scenarios(n_posts):
+    from django.conf import settings
+
+    from blog.models import Category, Post
+
+    pages = max(n_posts // settings.POSTS_PER_PAGE, 1)
+    category = Category.objects.order_by('pk').first()
+    post = Post.objects.order_by('-pub_date').first()
+    return {
+        'index': '/',
+        'index_deep_page': f'/?page={pages // 2}',
+        'index_last_page': f'/?page={pages}',
+        'category_posts': f'/category/{category.slug}/',
+        'profile': f'/profile/{post.author.username}/',
+        'post_detail': f'/posts/{post.pk}/',
+    }
+
+
+def measure(client, url, requests, warmup):
+    for _ in range(warmup):
+        client.get(url)
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        request_started = time.perf_counter()
+        response = client.get(url)
+        latencies.append((time.perf_counter() - request_started) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f'{url}: HTTP {response.status_code}')
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'url': url,
+        'requests': requests,
+        'rps': round(requests / elapsed, 1),
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+    }
+
+
+def run_size(args):
+    """Выполняется в отдельном процессе: одна база — одна настройка Django."""
+    data_dir = Path(args.data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    database = data_dir / (
+        f'blogicum-bench-{args.size}-{args.comments_per_post}.sqlite3')
+    fresh = not database.exists()
+    seed_started = time.perf_counter()
+    setup_django(database, page_cache=args.page_cache)
+    if fresh:
+        seed(args.size, args.comments_per_post)
+    seed_seconds = time.perf_counter() - seed_started
+
+    from django.test import Client
+
+    client = Client()
+    results = {
+        name: measure(client, url, args.requests, args.warmup)
+        for name, url in scenarios(args.size).items()
+    }
+    print(json.dumps({
+        'posts': args.size,
+        'comments': args.size * args.comments_per_post,
+        'setup_seconds': round(seed_seconds, 1) if fresh else None,
+        'scenarios': results,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--size', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--comments-per-post', type=int, default=3)
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument(
+        '--page-cache', action='store_true',
+        help='Измерять с кешем страниц для анонимов.')
+    parser.add_argument(
+        '--data-dir', default=tempfile.gettempdir(),
+        help='Каталог для баз с данными; готовые базы используются повторно.')
+    parser.add_argument('--output', help='Файл для результатов JSON.')
+    args = parser.parse_args()
+    if args.size:
+        run_size(args)
+        return
+
+    runs = []
+    for size in args.sizes:
+        command = [
+            sys.executable, __file__, '--size', str(size),
+            '--comments-per-post', str(args.comments_per_post),
+            '--requests', str(args.requests),
+            '--warmup', str(args.warmup),
+            '--data-dir', args.data_dir,
+        ]
+        if args.page_cache:
+            command.append('--page-cache')
+        output = subprocess.run(
+            command, check=True, stdout=subprocess.PIPE, text=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    report = json.dumps({
+        'revision': git_revision(),
+        'page_cache': args.page_cache,
+        'runs': runs,
+    }, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(report + '\n', encoding='utf-8')
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""Конкурентные чтение и запись в SQLite: профили базы default и production.
+
+Для каждого профиля (BLOGICUM_DB_PROFILE) в отдельном процессе создаётся
+файловая база с постами. Затем --duration секунд работают процессы:
+читатели открывают главную и страницы постов, писатели добавляют
+комментарии через view add_comment. Считаются операции в секунду,
+p95 задержки и ошибки "database is locked".
+
+Запуск: python benchmarks/sqlite_concurrency.py --readers 8 --writers 4
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import git_revision, percentile, setup_django
+
+PROFILES = ('default', 'production')
+
+
+def _timed(result, action):
+    from django.db import OperationalError
+
+    started = time.perf_counter()
+    try:
+        action()
+    except OperationalError as error:
+        if 'locked' not in str(error):
+            raise
+        result['locked'] += 1
+        return
+    result['latencies'].append((time.perf_counter() - started) * 1000)
+
+
+def worker(role, deadline, user_id, post_ids, results):
+    """Процесс-читатель или процесс-писатель; итог кладётся в results."""
+    from django.contrib.auth.models import User
+    from django.test import Client
+
+    client = Client()
+    if role == 'writes':
+        client.force_login(User.objects.get(pk=user_id))
+    result = {'role': role, 'latencies': [], 'locked': 0}
+    index = 0
+    while time.monotonic() < deadline:
+        index += 1
+        post_id = post_ids[index % len(post_ids)]
+        if role == 'writes':
+            _timed(result, lambda: client.post(
+                f'/posts/{post_id}/comment/', {'text': f'Стресс {index}'}))
+        else:
+            url = '/' if index % 2 else f'/posts/{post_id}/'
+            _timed(result, lambda: client.get(url))
+    results.put(result)
+
+
+def report(results, seconds):
+    latencies = sorted(
+        latency for result in results for latency in result['latencies'])
+    return {
+        'ops': len(latencies),
+        'ops_per_second': round(len(latencies) / seconds, 1),
+        'p95_ms': round(percentile(latencies, 95), 2) if latencies else None,
+        'locked_errors': sum(result['locked'] for result in results),
+    }
+
+
+def child(args):
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(Path(directory) / 'stress.sqlite3')
+        from django.conf import settings
+        from django.contrib.auth.models import User
+        from django.db import connections
+
+        from blog.models import Post
+        from feed_rendering import seed
+
+        seed(args.posts, 1)
+        post_ids = list(Post.objects.order_by('-pub_date').values_list(
+            'pk', flat=True)[:100])
+        user_ids = list(User.objects.order_by('pk').values_list(
+            'pk', flat=True)[:args.writers])
+        # Процессы наследуют настроенный Django, но не соединение с базой.
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        deadline = time.monotonic() + args.duration
+        processes = [
+            context.Process(
+                target=worker,
+                args=('reads', deadline, None, post_ids, results))
+            for _ in range(args.readers)
+        ] + [
+            context.Process(
+                target=worker,
+                args=('writes', deadline, user_id, post_ids, results))
+            for user_id in user_ids
+        ]
+        for process in processes:
+            process.start()
+        collected = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        print(json.dumps({
+            'profile': settings.DATABASE_PROFILE,
+            **{
+                role: report(
+                    [result for result in collected
+                     if result['role'] == role],
+                    args.duration)
+                for role in ('reads', 'writes')
+            },
+        }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--posts', type=int, default=2000)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+        return
+    runs = []
+    for profile in PROFILES:
+        output = subprocess.run(
+            [sys.executable, __file__, '--child',
+             '--readers', str(args.readers),
+             '--writers', str(args.writers),
+             '--duration', str(args.duration),
+             '--posts', str(args.posts)],
+            env={**os.environ, 'BLOGICUM_DB_PROFILE': profile},
+            check=True, stdout=subprocess.PIPE, text=True,
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    print(json.dumps({
+        'revision': git_revision(),
+        'readers': args.readers,
+        'writers': args.writers,
+        'runs': runs,
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""JSON API только для чтения: /api/v1/.
+
+Списки постов и комментариев листаются курсором (CursorPaginator), без
+COUNT(*) и OFFSET. Параметр ?fields=title,author выбирает поля ответа и
+сужает SQL: в only() попадают только нужные столбцы, а select_related —
+только нужные связи. JSON собирается из готовых словарей; если
+установлен orjson, сериализация идёт через него.
+"""
+import json
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from blog.models import Category, Comment, Post
+from blog.pagination import CursorPaginator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ApiField:
+    """Поле ответа: столбцы для only(), связь для select_related, значение."""
+
+    def __init__(self, getter, columns=(), related=None):
+        self.getter = getter
+        self.columns = columns
+        self.related = related
+
+
+def _isoformat(value):
+    # Строка заранее: одинаковый вывод у orjson и json.
+    return value.isoformat() if value else None
+
+
+POST_FIELDS = {
+    'id': ApiField(lambda post: post.pk),
+    'title': ApiField(lambda post: post.title, ('title',)),
+    'text': ApiField(lambda post: post.text, ('text',)),
+    'pub_date': ApiField(lambda post: _isoformat(post.pub_date)),
+    'updated_at': ApiField(
+        lambda post: _isoformat(post.updated_at), ('updated_at',)),
+    'author': ApiField(
+        lambda post: post.author.username, ('author__username',), 'author'),
+    'category': ApiField(
+        lambda post: post.category.slug, ('category__slug',), 'category'),
+    'location': ApiField(
+        lambda post: (
+            post.location.name
+            if post.location and post.location.is_published else None
+        ),
+        ('location__name', 'location__is_published'), 'location'),
+    'image': ApiField(
+        lambda post: post.image.url if post.image else None, ('image',)),
+    'comment_count': ApiField(
+        lambda post: post.comment_count, ('comment_count',)),
+}
+
+COMMENT_FIELDS = {
+    'id': ApiField(lambda comment: comment.pk),
+    'text': ApiField(lambda comment: comment.text, ('text',)),
+    'created_at': ApiField(lambda comment: _isoformat(comment.created_at)),
+    'author': ApiField(
+        lambda comment: comment.author.username,
+        ('author__username',), 'author'),
+}
+
+
+def _dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(
+        data, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def _json(data, status=200):
+    return HttpResponse(
+        _dumps(data), status=status, content_type='application/json')
+
+
+def _error(status, message):
+    return _json({'error': message}, status=status)
+
+
+def _unknown_fields(schema):
+    return _error(
+        400,
+        'В fields нет полей или есть неизвестные. Доступны: '
+        + ', '.join(schema))
+
+
+def _selected_fields(request, fields):
+    """Запрошенные поля (в порядке схемы) или None, если их нет в схеме."""
+    requested = request.GET.get('fields')
+    if not requested:
+        return list(fields)
+    names = {name.strip() for name in requested.split(',') if name.strip()}
+    # ?fields=, без единого имени — тоже ошибка, а не пустые объекты.
+    if not names or names - set(fields):
+        return None
+    return [name for name in fields if name in names]
+
+
+def _page(request, queryset, fields, schema, per_page, key, descending):
+    """Ответ со страницей queryset, сужённого до выбранных полей."""
+    related = {schema[name].related for name in fields} - {None}
+    columns = {column for name in fields for column in schema[name].columns}
+    # Связь без select_related стала бы отдельным запросом на каждую
+    # строку; пустой select_related() же подтянул бы все связи.
+    if related:
+        queryset = queryset.select_related(*related)
+    # Поле курсора нужно всегда.
+    queryset = queryset.only(key, *columns)
+    paginator = CursorPaginator(
+        queryset, per_page, field=key, descending=descending)
+    page = paginator.get_page(request.GET.get('cursor'))
+    return _json({
+        'results': [
+            {name: schema[name].getter(obj) for name in fields}
+            for obj in page
+        ],
+        'next_cursor': page.next_cursor,
+        'previous_cursor': page.previous_cursor,
+    })
+
+
+def _post_list(request, posts):
+    fields = _selected_fields(request, POST_FIELDS)
+    if fields is None:
+        return _unknown_fields(POST_FIELDS)
+    return _page(
+        request, posts, fields, POST_FIELDS, settings.POSTS_PER_PAGE,
+        'pub_date', descending=True)
+
+
+@require_GET
+def posts(request):
+    return _post_list(request, Post.objects.published())
+
+
+@require_GET
+def category_posts(request, category_slug):
+    category = Category.objects.filter(
+        slug=category_slug, is_published=True).only('pk').first()
+    if category is None:
+        return _error(404, 'Категория не найдена.')
+    return _post_list(
+        request, Post.objects.filter(category=category).published())
+
+
+@require_GET
+def post_comments(request, post_id):
+    fields = _selected_fields(request, COMMENT_FIELDS)
+    if fields is None:
+        return _unknown_fields(COMMENT_FIELDS)
+    if not Post.objects.published().filter(pk=post_id).exists():
+        return _error(404, 'Публикация не найдена.')
+    return _page(
+        request, Comment.objects.filter(post_id=post_id), fields,
+        COMMENT_FIELDS, settings.COMMENTS_PER_PAGE, 'created_at',
+        descending=False)
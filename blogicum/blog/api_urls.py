@@ -0,0 +1,13 @@
+from django.urls import path
+
+from blog import api
+
+app_name = 'api'
+
+urlpatterns = [
+    path('posts/', api.posts, name='posts'),
+    path('categories/<slug:category_slug>/posts/',
+         api.category_posts, name='category_posts'),
+    path('posts/<int:post_id>/comments/',
+         api.post_comments, name='post_comments'),
+]
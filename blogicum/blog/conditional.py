@@ -0,0 +1,121 @@
+"""Условный GET для анонимных читателей.
+
+Валидаторы считаются одним лёгким запросом без рендеринга шаблона; если
+страница не изменилась, клиент получает 304. Ленты сверяются только по
+ETag, страница поста — ещё и по Last-Modified. Вошедшим пользователям
+страница показывается персонально, поэтому для них заголовки не ставятся.
+"""
+import hashlib
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from blog.models import Post
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def _validators(*parts, last_modified):
+    digest = hashlib.md5(
+        ':'.join(str(part) for part in parts).encode(),
+        usedforsecurity=False
+    ).hexdigest()
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return f'W/"{digest}"', timestamp
+
+
+def _feed_validators(request, posts, *parts):
+    state = posts.feed_state()
+    # Пагинатор ленты возьмёт это число вместо отдельного COUNT(*),
+    # а список постов категории — состояние для ключа кеша.
+    request.feed_count = state['published_count']
+    request.feed_state = state
+    # Только ETag: удаление поста не сдвигает ни updated_at, ни pub_date,
+    # и Last-Modified ленты остался бы прежним (или даже стал бы старше).
+    return _validators(
+        *parts, state['last_updated'], state['last_published'],
+        state['published_count'],
+        last_modified=None
+    )
+
+
+def index_validators(request):
+    return _feed_validators(request, Post.objects.all(), 'index')
+
+
+def category_validators(request, category_slug):
+    return _feed_validators(
+        request, Post.objects.filter(category__slug=category_slug),
+        'category', category_slug
+    )
+
+
+def post_validators(request, post_id):
+    post = Post.objects.filter(pk=post_id).filter(
+        Post.objects.published_q()
+    ).values('updated_at', 'comment_count').first()
+    if post is None:
+        # Недоступный анонимам пост отдаёт 404 сама view.
+        return None
+    return _validators(
+        'post', post_id, post['updated_at'], post['comment_count'],
+        last_modified=post['updated_at']
+    )
+
+
+def _not_modified(request, validators):
+    if validators is None:
+        return None
+    etag, last_modified = validators
+    return get_conditional_response(
+        request, etag=etag, last_modified=last_modified)
+
+
+def _add_validators(response, validators):
+    if validators is None or response.status_code != 200:
+        return response
+    etag, last_modified = validators
+    response.headers.setdefault('ETag', etag)
+    if last_modified and not response.has_header('Last-Modified'):
+        response.headers['Last-Modified'] = http_date(last_modified)
+    # Браузер должен сверяться с сервером, а не показывать копию по эвристике.
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def conditional_page(validators_func):
+    """Декоратор view: 304 для анонимов, если валидаторы не изменились.
+
+    validators_func принимает аргументы view и возвращает пару
+    (etag, last_modified) или None, если страница недоступна.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            async_validators = sync_to_async(validators_func)
+
+            @wraps(view)
+            async def inner(request, *args, **kwargs):
+                if (request.method not in SAFE_METHODS
+                        or (await request.auser()).is_authenticated):
+                    return await view(request, *args, **kwargs)
+                validators = await async_validators(request, *args, **kwargs)
+                response = _not_modified(request, validators)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _add_validators(response, validators)
+        else:
+            @wraps(view)
+            def inner(request, *args, **kwargs):
+                if (request.method not in SAFE_METHODS
+                        or request.user.is_authenticated):
+                    return view(request, *args, **kwargs)
+                validators = validators_func(request, *args, **kwargs)
+                response = _not_modified(request, validators)
+                if response is None:
+                    response = view(request, *args, **kwargs)
+                return _add_validators(response, validators)
+        return inner
+    return decorator
@@ -0,0 +1,77 @@
+"""Выгрузка постов с комментариями в NDJSON.
+
+Одна строка — один пост со списком комментариев. Посты читаются через
+`iterator(chunk_size=...)`, комментарии подгружаются одним запросом на
+каждую пачку постов, поэтому память не зависит от объёма выгрузки.
+Используется командой `manage.py export_blog` и view `blog:export`.
+"""
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from blog.models import Comment, Post
+
+CHUNK_SIZE = 500
+
+
+def _start_of_day(day):
+    return timezone.make_aware(
+        datetime.datetime.combine(day, datetime.time.min))
+
+
+def export_posts(category=None, author=None, since=None, until=None):
+    """Посты для выгрузки; since и until — даты (включительно) pub_date."""
+    posts = Post.objects.select_related(
+        'author', 'category', 'location'
+    ).prefetch_related(Prefetch(
+        'comments',
+        queryset=Comment.objects.select_related('author').order_by(
+            'created_at', 'pk'),
+    ))
+    if category:
+        posts = posts.filter(category__slug=category)
+    if author:
+        posts = posts.filter(author__username=author)
+    # Границы суток вместо pub_date__date: так работает индекс по pub_date.
+    if since:
+        posts = posts.filter(pub_date__gte=_start_of_day(since))
+    if until:
+        posts = posts.filter(
+            pub_date__lt=_start_of_day(until + datetime.timedelta(days=1)))
+    return posts.order_by('pk')
+
+
+def _post_data(post):
+    return {
+        'id': post.pk,
+        'title': post.title,
+        'text': post.text,
+        'pub_date': post.pub_date,
+        'is_published': post.is_published,
+        'created_at': post.created_at,
+        'updated_at': post.updated_at,
+        'author': post.author.username,
+        'category': post.category.slug if post.category else None,
+        'location': post.location.name if post.location else None,
+        'image': post.image.name or None,
+        'comments': [
+            {
+                'id': comment.pk,
+                'author': comment.author.username,
+                'text': comment.text,
+                'created_at': comment.created_at,
+            }
+            for comment in post.comments.all()
+        ],
+    }
+
+
+def iter_ndjson(posts, chunk_size=CHUNK_SIZE):
+    """Строки NDJSON (с переводом строки) для каждого поста."""
+    for post in posts.iterator(chunk_size=chunk_size):
+        yield json.dumps(
+            _post_data(post), cls=DjangoJSONEncoder, ensure_ascii=False
+        ) + '\n'
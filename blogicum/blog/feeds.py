@@ -0,0 +1,164 @@
+"""Ленты RSS и Atom: вся лента, категория и автор.
+
+Готовый XML хранится в кеше вместе с ETag, поэтому повторный и условный
+запросы ленты обходятся без базы данных. Сигналы
+сбрасывают кеш (`invalidate()`) при изменении постов, категорий или имени
+автора; записи из других процессов сигналов не шлют, поэтому XML к тому
+же живёт не дольше settings.FEED_CACHE_TIMEOUT.
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.syndication.views import Feed
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+
+from blog.models import Category, Post
+from core import cache
+
+NAMESPACE = 'feeds'
+# Last-Modified ленты (дата самого нового поста) не сдвигается при удалении
+# поста, поэтому ленты сверяются только по ETag.
+CACHED_HEADERS = ('Content-Type',)
+
+
+def invalidate():
+    cache.bump_version(NAMESPACE)
+
+
+class LatestPostsFeed(Feed):
+    title = 'Блогикум'
+    description = 'Новые публикации Блогикума.'
+
+    def link(self, obj):
+        return reverse('blog:index')
+
+    def get_posts(self, obj):
+        return Post.objects.published()
+
+    def items(self, obj):
+        return self.get_posts(obj).with_feed_relations()[:settings.FEED_SIZE]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('blog:post_detail', args=(item.pk,))
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_author_link(self, item):
+        return reverse('blog:profile', args=(item.author.username,))
+
+    def item_categories(self, item):
+        return (item.category.title,)
+
+
+class CategoryFeed(LatestPostsFeed):
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True)
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=(obj.slug,))
+
+    def get_posts(self, obj):
+        return Post.objects.filter(category=obj).published()
+
+
+class AuthorFeed(LatestPostsFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f'Блогикум: {obj.username}'
+
+    def description(self, obj):
+        return f'Публикации пользователя {obj.username}.'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=(obj.username,))
+
+    def get_posts(self, obj):
+        return Post.objects.filter(author=obj).published()
+
+
+class AtomMixin:
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self._get_dynamic_attr('description', obj)
+
+
+class LatestPostsAtomFeed(AtomMixin, LatestPostsFeed):
+    pass
+
+
+class CategoryAtomFeed(AtomMixin, CategoryFeed):
+    pass
+
+
+class AuthorAtomFeed(AtomMixin, AuthorFeed):
+    pass
+
+
+def _conditional(request, cached):
+    return get_conditional_response(request, etag=cached['etag'])
+
+
+def cached_feed(feed):
+    """View ленты, отдающая сохранённый XML до invalidate() или истечения."""
+    def view(request, *args, **kwargs):
+        cached = cache.get(NAMESPACE, request.path)
+        if cached is None:
+            response = feed(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            cached = {
+                'content': response.content,
+                'etag': '"{}"'.format(hashlib.md5(
+                    response.content, usedforsecurity=False).hexdigest()),
+                'headers': {
+                    name: response.headers[name]
+                    for name in CACHED_HEADERS if response.has_header(name)
+                },
+            }
+            cache.set(
+                NAMESPACE, request.path, cached,
+                settings.FEED_CACHE_TIMEOUT)
+        response = _conditional(request, cached)
+        if response is None:
+            response = HttpResponse(cached['content'])
+        for name, value in cached['headers'].items():
+            response.headers[name] = value
+        response.headers['ETag'] = cached['etag']
+        return response
+    return view
+
+
+latest_rss = cached_feed(LatestPostsFeed())
+latest_atom = cached_feed(LatestPostsAtomFeed())
+category_rss = cached_feed(CategoryFeed())
+category_atom = cached_feed(CategoryAtomFeed())
+author_rss = cached_feed(AuthorFeed())
+author_atom = cached_feed(AuthorAtomFeed())
@@ -45,3 +45,10 @@ class PasswordChangeForm(forms.Form):
         label='Новый пароль', widget=forms.PasswordInput)
     password2 = forms.CharField(
         label='Подтверждение пароля', widget=forms.PasswordInput)
+
+
+class ExportForm(forms.Form):
+    category = forms.SlugField(required=False)
+    author = forms.CharField(required=False)
+    since = forms.DateField(required=False)
+    until = forms.DateField(required=False)
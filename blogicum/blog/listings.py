@@ -0,0 +1,38 @@
+"""Сохранённые в кеше списки id опубликованных постов категорий.
+
+Список строится одним запросом. Ключ включает состояние постов категории
+(Post.objects.feed_state(): последнее изменение, последняя публикация,
+число опубликованных), поэтому любая запись в базу — в том числе из другого
+процесса, например `publish_scheduled` — сразу даёт новый ключ, а старый
+список просто истекает через settings.CATEGORY_LISTING_TIMEOUT.
+"""
+from django.conf import settings
+
+from blog.models import Post
+from core import cache
+
+NAMESPACE = 'category_post_ids'
+
+
+def category_post_ids(category, state=None):
+    """Упорядоченные id постов категории.
+
+    state — готовый feed_state() постов категории (его считает условный
+    GET); без него состояние читается отдельным агрегатным запросом.
+    """
+    posts = Post.objects.filter(category=category)
+    if state is None:
+        state = posts.feed_state()
+    key = (
+        category.pk, state['last_updated'], state['last_published'],
+        state['published_count'],
+    )
+    post_ids = cache.get(NAMESPACE, key)
+    if post_ids is None:
+        post_ids = list(
+            posts.published().order_by('-pub_date', '-pk').values_list(
+                'pk', flat=True)
+        )
+        cache.set(
+            NAMESPACE, key, post_ids, settings.CATEGORY_LISTING_TIMEOUT)
+    return post_ids
@@ -0,0 +1,192 @@
+"""Быстрая загрузка фикстур (команда `manage.py bulk_load`).
+
+В отличие от loaddata, фикстура не читается в память целиком: массив JSON
+разбирается по одному объекту, NDJSON — по строкам. Объекты копятся по
+моделям и пишутся `bulk_create` пачками, каждая в своей транзакции; перед
+пачкой модели записываются накопленные объекты моделей, на которые она
+ссылается (Category/Location → User → Post → Comment). Сигналы при этом не
+отправляются, поэтому производные данные (счётчики комментариев, видимость,
+поисковый индекс, кеши) пересчитываются одним проходом в конце.
+"""
+import json
+import re
+from collections import Counter
+from itertools import chain
+
+from django.core.management.color import no_style
+from django.core.serializers.python import Deserializer
+from django.db import connection, transaction
+
+from blog import feeds, listings, search
+from blog.models import Post
+from blog.publishing import resync_visibility
+from core import cache, page_cache
+
+BATCH_SIZE = 2000
+CHUNK_SIZE = 64 * 1024
+
+_SEPARATORS = re.compile(r'[\s,]*')
+
+
+def _iter_array(stream, chunk_size):
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    while True:
+        pos = _SEPARATORS.match(buffer, pos).end()
+        if pos < len(buffer) and buffer[pos] == ']':
+            return
+        try:
+            obj, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # Объект обрезан границей куска — дочитываем файл.
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                raise
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        yield obj
+
+
+def iter_fixture(stream, chunk_size=CHUNK_SIZE):
+    """Объекты фикстуры по одному: массив JSON (как у dumpdata) или NDJSON."""
+    first = stream.read(1)
+    while first.isspace():
+        first = stream.read(1)
+    if first == '[':
+        yield from _iter_array(stream, chunk_size)
+        return
+    lines = chain([first + stream.readline()], stream)
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as error:
+                raise ValueError(f'Строка {number}: {error}') from error
+
+
+def _dependencies(model):
+    """Модели, на которые ссылаются внешние ключи и связи M2M модели."""
+    related = (
+        field.related_model
+        for field in (*model._meta.concrete_fields,
+                      *model._meta.local_many_to_many)
+        if field.is_relation
+    )
+    return [other for other in related if other not in (None, model)]
+
+
+class _Loader:
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.pending = {}
+        self.counts = Counter()
+        self._flushing = set()
+
+    def add(self, deserialized):
+        model = type(deserialized.object)
+        batch = self.pending.setdefault(model, [])
+        batch.append(deserialized)
+        if len(batch) >= self.batch_size:
+            self.flush(model)
+
+    def flush_all(self):
+        while self.pending:
+            self.flush(next(iter(self.pending)))
+
+    def flush(self, model):
+        # Циклические ссылки не разворачиваются: их ловит проверка ключей.
+        self._flushing.add(model)
+        for dependency in _dependencies(model):
+            if dependency in self.pending and dependency not in self._flushing:
+                self.flush(dependency)
+        self._flushing.discard(model)
+        batch = self.pending.pop(model, [])
+        if not batch:
+            return
+        with transaction.atomic():
+            self._insert(model, [item.object for item in batch])
+            self._insert_m2m(model, batch)
+        self.counts[model] += len(batch)
+
+    @staticmethod
+    def _insert(model, objects):
+        manager = model._base_manager
+        new = [obj for obj in objects if obj.pk is None]
+        if new:
+            manager.bulk_create(new)
+        existing = [obj for obj in objects if obj.pk is not None]
+        if not existing:
+            return
+        # Как и loaddata, объект с уже занятым pk перезаписывает строку.
+        pk = model._meta.pk
+        update_fields = [
+            field.name for field in model._meta.concrete_fields
+            if not field.primary_key
+        ]
+        if update_fields:
+            manager.bulk_create(
+                existing, update_conflicts=True,
+                unique_fields=[pk.name], update_fields=update_fields,
+            )
+        else:
+            manager.bulk_create(existing, ignore_conflicts=True)
+
+    @staticmethod
+    def _insert_m2m(model, batch):
+        rows = {}
+        for item in batch:
+            for name, related_pks in (item.m2m_data or {}).items():
+                field = model._meta.get_field(name)
+                through = field.remote_field.through
+                source = through._meta.get_field(
+                    field.m2m_field_name()).attname
+                target = through._meta.get_field(
+                    field.m2m_reverse_field_name()).attname
+                rows.setdefault(through, []).extend(
+                    through(**{source: item.object.pk, target: related_pk})
+                    for related_pk in related_pks
+                )
+        for through, objects in rows.items():
+            through._base_manager.bulk_create(objects, ignore_conflicts=True)
+
+
+def _reset_sequences(models):
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def refresh_derived_data():
+    """То, что при обычном сохранении делают сигналы и Post.save()."""
+    Post.objects.recount_comments()
+    resync_visibility()
+    search.rebuild_index()
+    cache.bump_version(listings.NAMESPACE)
+    page_cache.invalidate()
+    feeds.invalidate()
+
+
+def bulk_load(stream, batch_size=BATCH_SIZE):
+    """Загружает фикстуру из открытого текстового файла.
+
+    Возвращает Counter: модель → число записанных объектов. Пачки
+    фиксируются по мере записи: при ошибке уже записанные остаются в базе.
+    """
+    loader = _Loader(batch_size)
+    with connection.constraint_checks_disabled():
+        for deserialized in Deserializer(iter_fixture(stream)):
+            loader.add(deserialized)
+        loader.flush_all()
+    # Порядок вставки сам по себе не гарантирует целостность: ссылки на
+    # отсутствующие строки ищутся после загрузки, как в loaddata.
+    connection.check_constraints(
+        table_names=[model._meta.db_table for model in loader.counts])
+    _reset_sequences(list(loader.counts))
+    if loader.counts:
+        refresh_derived_data()
+    return loader.counts
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DeserializationError
+from django.db import IntegrityError
+
+from blog.loading import BATCH_SIZE, bulk_load
+
+
+class Command(BaseCommand):
+    help = (
+        'Быстро загружает фикстуру JSON или NDJSON через bulk_create '
+        '(замена loaddata для больших дампов).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixtures', nargs='+', help='Пути к фикстурам.')
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Объектов одной модели в пачке (и транзакции).'
+        )
+
+    def handle(self, *args, fixtures, batch_size=BATCH_SIZE, **options):
+        for path in fixtures:
+            try:
+                with open(path, encoding='utf-8') as stream:
+                    counts = bulk_load(stream, batch_size)
+            except (OSError, ValueError, DeserializationError,
+                    IntegrityError) as error:
+                raise CommandError(f'{path}: {error}') from error
+            for model, count in sorted(
+                    counts.items(), key=lambda item: item[0]._meta.label):
+                self.stdout.write(f'{model._meta.label}: {count}')
+            self.stdout.write(self.style.SUCCESS(
+                f'{path}: загружено объектов {sum(counts.values())}'))
@@ -0,0 +1,39 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from blog.export import CHUNK_SIZE, export_posts, iter_ndjson
+
+
+class Command(BaseCommand):
+    help = 'Выгружает посты с комментариями в NDJSON (по строке на пост).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', help='Файл для выгрузки; по умолчанию stdout.')
+        parser.add_argument('--category', help='Slug категории.')
+        parser.add_argument('--author', help='Имя пользователя автора.')
+        parser.add_argument(
+            '--since', type=datetime.date.fromisoformat,
+            help='Дата публикации не раньше (ГГГГ-ММ-ДД).'
+        )
+        parser.add_argument(
+            '--until', type=datetime.date.fromisoformat,
+            help='Дата публикации не позже (ГГГГ-ММ-ДД).'
+        )
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, output=None, category=None, author=None,
+               since=None, until=None, chunk_size=CHUNK_SIZE, **options):
+        posts = export_posts(category, author, since, until)
+        lines = iter_ndjson(posts, chunk_size)
+        if output is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        exported = 0
+        with open(output, 'w', encoding='utf-8') as stream:
+            for line in lines:
+                stream.write(line)
+                exported += 1
+        self.stderr.write(f'Выгружено постов: {exported}')
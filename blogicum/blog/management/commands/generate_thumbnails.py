@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import Post
+from blog.thumbnails import generate_thumbnails, has_thumbnails
+from core import page_cache
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии изображений существующих публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Пересоздать копии, даже если они уже есть.'
+        )
+
+    def handle(self, *args, force=False, **options):
+        created = 0
+        posts = Post.objects.exclude(image='').only('image')
+        for post in posts.iterator(chunk_size=500):
+            if not force and has_thumbnails(post.image):
+                continue
+            if generate_thumbnails(post.image):
+                # Как и фоновая задача: новая версия updated_at сбрасывает
+                # карточку, закешированную ещё без уменьшенной копии.
+                Post.objects.filter(pk=post.pk).update(
+                    updated_at=timezone.now())
+                created += 1
+        if created:
+            page_cache.invalidate()
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано изображений: {created}'))
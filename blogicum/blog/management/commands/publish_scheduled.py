@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.publishing import publish_due_posts, resync_visibility
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+class Command(BaseCommand):
+    help = 'Публикует посты, время публикации которых наступило.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а проверять посты каждые --interval с.'
+        )
+        parser.add_argument('--interval', type=float, default=30)
+        parser.add_argument(
+            '--resync', action='store_true',
+            help=(
+                'Сначала пересчитать видимость всех постов (после записи'
+                ' в базу в обход save() и сигналов).'
+            )
+        )
+
+    def handle(self, *args, loop=False, interval=30, resync=False,
+               **options):
+        if resync:
+            fixed = resync_visibility()
+            self.stdout.write(f'Исправлена видимость постов: {fixed}')
+        if loop and (settings.CACHES['default']['BACKEND']
+                     in PROCESS_LOCAL_CACHES):
+            # Сигнал posts_published сбросит только кеш этого процесса.
+            self.stderr.write(self.style.WARNING(
+                'Кеш локален для процесса: веб-процессы увидят новые посты'
+                ' только по истечении сроков кеша. Для --loop задайте'
+                ' общий кеш (BLOGICUM_CACHE_BACKEND=file).'
+            ))
+        while True:
+            published = publish_due_posts()
+            if published or not loop:
+                self.stdout.write(f'Опубликовано постов: {published}')
+            if not loop:
+                return
+            time.sleep(interval)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from core import page_cache
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённые счётчики комментариев у публикаций.'
+
+    def handle(self, *args, **options):
+        fixed = Post.objects.recount_comments()
+        if fixed:
+            page_cache.invalidate()
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено счётчиков комментариев: {fixed}'))
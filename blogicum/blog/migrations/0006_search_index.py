@@ -0,0 +1,65 @@
+# Generated by Django 5.2 on 2026-10-18 20:20
+
+import re
+from collections import Counter
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+TITLE_WEIGHT = 10
+
+
+def tokenize(text):
+    return [word[:64] for word in re.findall(r'\w+', text.lower())]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE blog_post_fts USING fts5(title, text)')
+        schema_editor.execute(
+            'INSERT INTO blog_post_fts (rowid, title, text) '
+            'SELECT id, title, text FROM blog_post'
+        )
+        return
+    Post = apps.get_model('blog', 'Post')
+    SearchTerm = apps.get_model('blog', 'SearchTerm')
+    for post in Post.objects.only('title', 'text').iterator(chunk_size=500):
+        weights = Counter()
+        for term in tokenize(post.title):
+            weights[term] += TITLE_WEIGHT
+        weights.update(tokenize(post.text))
+        SearchTerm.objects.bulk_create([
+            SearchTerm(term=term, post_id=post.pk, weight=weight)
+            for term, weight in weights.items()
+        ])
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS blog_post_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Слово')),
+                ('weight', models.PositiveIntegerField(verbose_name='Вес')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='blog.post', verbose_name='Пост')),
+            ],
+            options={
+                'verbose_name': 'слово поискового индекса',
+                'verbose_name_plural': 'Поисковый индекс',
+                'constraints': [models.UniqueConstraint(fields=('term', 'post'), name='search_term_post_unique')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
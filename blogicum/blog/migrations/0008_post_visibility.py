@@ -0,0 +1,53 @@
+# Generated by Django 5.2 on 2026-10-18 20:34
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_visibility(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    now = timezone.now()
+    Post.objects.filter(
+        is_published=True, pub_date__lte=now
+    ).update(visibility='visible')
+    Post.objects.filter(
+        is_published=True, pub_date__gt=now
+    ).update(visibility='scheduled')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_image_processing'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_published_pub_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_category_pub_date_idx',
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='visibility',
+            field=models.CharField(choices=[('hidden', 'Снят с публикации'), ('scheduled', 'Отложен'), ('visible', 'Виден читателям')], default='hidden', editable=False, max_length=10, verbose_name='Видимость'),
+        ),
+        migrations.RunPython(fill_visibility, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('visibility', 'visible')), fields=['pub_date'], name='post_published_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('visibility', 'visible')), fields=['category', 'pub_date'], name='post_category_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('visibility', 'scheduled')), fields=['pub_date'], name='post_scheduled_pub_date_idx'),
+        ),
+    ]
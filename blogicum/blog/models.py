@@ -1,8 +1,58 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
 from core.models import PublishedModel
 
 
+class PostQuerySet(models.QuerySet):
+    @staticmethod
+    def published_q():
+        # visibility уже учитывает is_published и наступление pub_date (её
+        # выставляют Post.save() и manage.py publish_scheduled), поэтому
+        # выборка не зависит от текущего времени.
+        return Q(visibility=Post.VISIBLE, category__is_published=True)
+
+    def due_for_publication(self, now=None):
+        return self.filter(
+            visibility=Post.SCHEDULED,
+            pub_date__lte=now or timezone.now()
+        )
+
+    def published(self):
+        return self.filter(self.published_q())
+
+    def feed_state(self):
+        """Состояние ленты одним агрегатным запросом (для условного GET).
+
+        last_updated берётся по всем постам, чтобы снятие с публикации тоже
+        меняло состояние.
+        """
+        published = self.published_q()
+        return self.aggregate(
+            last_updated=Max('updated_at'),
+            last_published=Max('pub_date', filter=published),
+            published_count=Count('pk', filter=published),
+        )
+
+    def with_feed_relations(self):
+        return self.select_related(
+            'author', 'category', 'location'
+        ).order_by('-pub_date', '-pk')
+
+    def recount_comments(self):
+        actual = Coalesce(Subquery(
+            Comment.objects.filter(post=OuterRef('pk')).values(
+                'post'
+            ).annotate(total=Count('pk')).values('total')
+        ), 0)
+        return self.annotate(actual=actual).exclude(
+            comment_count=F('actual')
+        ).update(comment_count=actual)
+
+
 class Category(PublishedModel):
     title = models.CharField(max_length=256, verbose_name='Заголовок')
     description = models.TextField(verbose_name='Описание')
@@ -28,6 +78,15 @@ class Location(PublishedModel):
 
 
 class Post(PublishedModel):
+    HIDDEN = 'hidden'
+    SCHEDULED = 'scheduled'
+    VISIBLE = 'visible'
+    VISIBILITY_CHOICES = (
+        (HIDDEN, 'Снят с публикации'),
+        (SCHEDULED, 'Отложен'),
+        (VISIBLE, 'Виден читателям'),
+    )
+
     title = models.CharField(max_length=256, verbose_name='Заголовок')
     text = models.TextField(verbose_name='Текст')
     pub_date = models.DateTimeField(verbose_name='Дата и время публикации')
@@ -52,15 +111,78 @@ class Post(PublishedModel):
         related_name='posts'
     )
     image = models.ImageField(verbose_name='Изображение', upload_to='images/')
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+    # Не auto_now: фикстуры (raw-сохранение) пропускают pre_save поля и
+    # без значения по умолчанию упали бы на NOT NULL. Время правки ставит
+    # приёмник pre_save в blog.signals.
+    updated_at = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+        verbose_name='Изменено'
+    )
+    image_processing = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Изображение обрабатывается'
+    )
+    visibility = models.CharField(
+        max_length=10,
+        choices=VISIBILITY_CHOICES,
+        default=HIDDEN,
+        editable=False,
+        verbose_name='Видимость'
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(visibility='visible'),
+                name='post_published_pub_date_idx'
+            ),
+            models.Index(
+                fields=('category', 'pub_date'),
+                condition=models.Q(visibility='visible'),
+                name='post_category_pub_date_idx'
+            ),
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(visibility='scheduled'),
+                name='post_scheduled_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_pub_date_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title
 
+    def actual_visibility(self):
+        if not self.is_published:
+            return self.HIDDEN
+        if self.pub_date > timezone.now():
+            return self.SCHEDULED
+        return self.VISIBLE
+
+    def save(self, *args, **kwargs):
+        self.visibility = self.actual_visibility()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {
+                *update_fields, 'visibility', 'updated_at'}
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     text = models.TextField(verbose_name='Текст')
@@ -82,6 +204,35 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_at_idx'
+            ),
+        )
 
     def __str__(self):
         return self.text[:20]
+
+
+class SearchTerm(models.Model):
+    term = models.CharField(max_length=64, verbose_name='Слово')
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name='Пост',
+        related_name='search_terms'
+    )
+    weight = models.PositiveIntegerField(verbose_name='Вес')
+
+    class Meta:
+        verbose_name = 'слово поискового индекса'
+        verbose_name_plural = 'Поисковый индекс'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('term', 'post'), name='search_term_post_unique'
+            ),
+        )
+
+    def __str__(self):
+        return self.term
@@ -0,0 +1,203 @@
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Q
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+def encode_cursor(direction, value, pk):
+    raw = f'{direction}|{value.isoformat()}|{pk}'
+    return urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Возвращает (направление, значение, pk) или None для битого курсора."""
+    try:
+        raw = urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        direction, value, pk = raw.split('|')
+        if direction not in (NEXT, PREVIOUS):
+            return None
+        return direction, datetime.fromisoformat(value), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+class CursorPage:
+    is_cursor = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Пагинация по ключу (field, id) без COUNT(*) и OFFSET.
+
+    Стоимость любой страницы не зависит от её «глубины»: запрос всегда
+    начинается с позиции курсора и читает per_page + 1 строк. По
+    умолчанию — лента постов от новых к старым.
+    """
+
+    def __init__(self, queryset, per_page, field='pub_date', descending=True):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+        self.descending = descending
+
+    def get_page(self, cursor=None):
+        position = decode_cursor(cursor) if cursor else None
+        posts = list(self._window(position))
+        if position is not None and not posts:
+            return self.get_page()
+        return self._make_page(position, posts)
+
+    async def aget_page(self, cursor=None):
+        position = decode_cursor(cursor) if cursor else None
+        posts = [post async for post in self._window(position)]
+        if position is not None and not posts:
+            return await self.aget_page()
+        return self._make_page(position, posts)
+
+    def _window(self, position):
+        """Запрос на per_page + 1 строк, начиная с позиции курсора."""
+        descending = self.descending
+        queryset = self.queryset
+        if position is not None:
+            direction, value, pk = position
+            # Назад по ленте — против её порядка; страница потом
+            # разворачивается в _make_page.
+            if direction == PREVIOUS:
+                descending = not descending
+            lookup = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': value})
+                | Q(**{self.field: value, f'pk__{lookup}': pk})
+            )
+        prefix = '-' if descending else ''
+        return queryset.order_by(
+            f'{prefix}{self.field}', f'{prefix}pk')[:self.per_page + 1]
+
+    def _cursor(self, direction, obj):
+        return encode_cursor(direction, getattr(obj, self.field), obj.pk)
+
+    def _make_page(self, position, posts):
+        has_more = len(posts) > self.per_page
+        posts = posts[:self.per_page]
+        if position is None:
+            has_next, has_previous = has_more, False
+        elif position[0] == NEXT:
+            has_next, has_previous = has_more, True
+        else:
+            posts.reverse()
+            has_next, has_previous = True, has_more
+        return CursorPage(
+            posts,
+            next_cursor=(
+                self._cursor(NEXT, posts[-1])
+                if has_next and posts else None
+            ),
+            previous_cursor=(
+                self._cursor(PREVIOUS, posts[0])
+                if has_previous and posts else None
+            ),
+        )
+
+
+def _feed_count(request):
+    # Условный GET (blog.conditional) уже посчитал посты ленты.
+    return getattr(request, 'feed_count', None)
+
+
+def is_cursor_mode(request):
+    return settings.POSTS_PAGINATION == 'cursor' or 'cursor' in request.GET
+
+
+def get_page_obj(request, posts):
+    if is_cursor_mode(request):
+        paginator = CursorPaginator(posts, settings.POSTS_PER_PAGE)
+        return paginator.get_page(request.GET.get('cursor'))
+    paginator = Paginator(posts, settings.POSTS_PER_PAGE)
+    count = _feed_count(request)
+    if count is not None:
+        paginator.count = count
+    return paginator.get_page(request.GET.get('page'))
+
+
+async def aget_page_obj(request, posts):
+    if is_cursor_mode(request):
+        paginator = CursorPaginator(posts, settings.POSTS_PER_PAGE)
+        return await paginator.aget_page(request.GET.get('cursor'))
+    paginator = Paginator(posts, settings.POSTS_PER_PAGE)
+    # Paginator синхронный: считаем строки заранее, а срез страницы
+    # (ленивый QuerySet) вычисляем асинхронно.
+    count = _feed_count(request)
+    paginator.count = await posts.acount() if count is None else count
+    page_obj = paginator.get_page(request.GET.get('page'))
+    page_obj.object_list = [post async for post in page_obj.object_list]
+    return page_obj
+
+
+def get_id_page_obj(request, post_ids, posts):
+    """Страница по готовому упорядоченному списку id.
+
+    Срез списка заменяется постами из `posts` (в том же порядке) одним
+    запросом pk__in; COUNT(*) не нужен.
+    """
+    paginator = Paginator(post_ids, settings.POSTS_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    page_obj.object_list = list(
+        posts.filter(pk__in=page_obj.object_list))
+    return page_obj
+
+
+async def aget_id_page_obj(request, post_ids, posts):
+    paginator = Paginator(post_ids, settings.POSTS_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    page_obj.object_list = [
+        post async for post in posts.filter(pk__in=page_obj.object_list)
+    ]
+    return page_obj
+
+
+def get_comments_page(request, post):
+    comments = post.comments.select_related('author')
+    # COUNT(*) по индексу (post_id, created_at) дёшев; post.comment_count
+    # только для показа: он может отставать (bulk_create, loaddata), и
+    # комментарии сверх него пропали бы со страницы.
+    paginator = Paginator(comments, settings.COMMENTS_PER_PAGE)
+    return paginator.get_page(request.GET.get('comments_page'))
+
+
+async def aget_comments_page(request, post):
+    comments = post.comments.select_related('author')
+    paginator = Paginator(comments, settings.COMMENTS_PER_PAGE)
+    paginator.count = await comments.acount()
+    page_obj = paginator.get_page(request.GET.get('comments_page'))
+    page_obj.object_list = [
+        comment async for comment in page_obj.object_list
+    ]
+    return page_obj
@@ -0,0 +1,57 @@
+"""Отложенная публикация.
+
+Пост с будущей pub_date сохраняется в состоянии SCHEDULED;
+`publish_due_posts()` (команда `manage.py publish_scheduled`) делает его
+VISIBLE, когда время наступает, и рассылает сигнал `posts_published` для
+сброса кешей.
+"""
+from django.dispatch import Signal
+from django.utils import timezone
+
+from blog.models import Post
+
+# Аргументы: post_ids, category_ids.
+posts_published = Signal()
+
+
+def publish_due_posts(now=None):
+    """Делает видимыми посты, чьё время пришло; возвращает их количество."""
+    now = now or timezone.now()
+    due = list(Post.objects.due_for_publication(now).values_list(
+        'pk', 'category_id'))
+    if not due:
+        return 0
+    post_ids = [pk for pk, _ in due]
+    # Условие повторяется в UPDATE: пост, который между выборкой и записью
+    # сняли с публикации, перенесли или опубликовал другой процесс, не
+    # трогается. updated_at сдвигается, чтобы сменились ETag лент и ключи
+    # карточек.
+    published = Post.objects.filter(
+        pk__in=post_ids, visibility=Post.SCHEDULED, pub_date__lte=now
+    ).update(visibility=Post.VISIBLE, updated_at=now)
+    if not published:
+        return 0
+    posts_published.send(
+        sender=Post,
+        post_ids=post_ids,
+        category_ids={category_id for _, category_id in due},
+    )
+    return published
+
+
+def resync_visibility(now=None):
+    """Пересчитывает visibility всех постов (после записи в обход save()).
+
+    Возвращает количество исправленных постов.
+    """
+    now = now or timezone.now()
+    hidden = Post.objects.filter(is_published=False).exclude(
+        visibility=Post.HIDDEN).update(visibility=Post.HIDDEN)
+    scheduled = Post.objects.filter(
+        is_published=True, pub_date__gt=now
+    ).exclude(visibility=Post.SCHEDULED).update(visibility=Post.SCHEDULED)
+    # Наступившие публикации доводит publish_due_posts() с рассылкой сигнала.
+    Post.objects.filter(
+        is_published=True, pub_date__lte=now, visibility=Post.HIDDEN
+    ).update(visibility=Post.SCHEDULED)
+    return hidden + scheduled + publish_due_posts(now)
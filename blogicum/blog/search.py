@@ -0,0 +1,116 @@
+"""Полнотекстовый поиск по публикациям.
+
+На SQLite используется виртуальная таблица FTS5 `blog_post_fts` (rowid
+совпадает с id поста), на остальных СУБД — собственный обратный индекс
+в модели SearchTerm. Оба индекса обновляются сигналами модели Post.
+"""
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, Count, IntegerField, Sum, When
+
+from blog.models import Post, SearchTerm
+
+FTS_TABLE = 'blog_post_fts'
+TITLE_WEIGHT = 10
+TERM_MAX_LENGTH = 64
+WORD_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return [
+        word[:TERM_MAX_LENGTH] for word in WORD_RE.findall(text.lower())
+    ]
+
+
+def get_backend():
+    backend = settings.SEARCH_BACKEND
+    if backend == 'auto':
+        return 'fts5' if connection.vendor == 'sqlite' else 'terms'
+    return backend
+
+
+def index_post(post):
+    if get_backend() == 'fts5':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+                'VALUES (%s, %s, %s)',
+                [post.pk, post.title, post.text]
+            )
+        return
+    weights = Counter()
+    for term in tokenize(post.title):
+        weights[term] += TITLE_WEIGHT
+    weights.update(tokenize(post.text))
+    SearchTerm.objects.filter(post_id=post.pk).delete()
+    SearchTerm.objects.bulk_create([
+        SearchTerm(term=term, post_id=post.pk, weight=weight)
+        for term, weight in weights.items()
+    ])
+
+
+def remove_post(post_id):
+    if get_backend() == 'fts5':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+    # Строки SearchTerm удаляются каскадно вместе с постом.
+
+
+def rebuild_index():
+    if get_backend() == 'fts5':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+                'SELECT id, title, text FROM blog_post'
+            )
+            return cursor.rowcount
+    SearchTerm.objects.all().delete()
+    indexed = 0
+    for post in Post.objects.only('title', 'text').iterator(chunk_size=500):
+        index_post(post)
+        indexed += 1
+    return indexed
+
+
+def ranked_post_ids(query, limit):
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+    if get_backend() == 'fts5':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s '
+                f'ORDER BY bm25({FTS_TABLE}, {TITLE_WEIGHT}.0, 1.0) '
+                'LIMIT %s',
+                [match, limit]
+            )
+            return [row[0] for row in cursor.fetchall()]
+    return list(
+        SearchTerm.objects.filter(term__in=terms).values('post').annotate(
+            matched=Count('term'), score=Sum('weight')
+        ).filter(matched=len(terms)).order_by(
+            '-score', '-post'
+        ).values_list('post', flat=True)[:limit]
+    )
+
+
+def search_posts(query):
+    ids = ranked_post_ids(query, settings.SEARCH_MAX_RESULTS)
+    if not ids:
+        return Post.objects.none()
+    rank = Case(
+        *[When(pk=pk, then=position) for position, pk in enumerate(ids)],
+        output_field=IntegerField()
+    )
+    return Post.objects.published().with_feed_relations().filter(
+        pk__in=ids
+    ).order_by(rank)
@@ -0,0 +1,155 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db.models import F, Q
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from blog import feeds, search
+from blog.models import Category, Comment, Location, Post
+from blog.publishing import posts_published
+from core import page_cache
+
+POST_CARD_FRAGMENT = 'post_card'
+
+
+def post_card_cache_key(post):
+    # Должен совпадать с аргументами тега {% cache %} в post_card.html.
+    return make_template_fragment_key(
+        POST_CARD_FRAGMENT, [post.pk, post.updated_at.timestamp()])
+
+
+def forget_post_card(post):
+    if post.pk and post.updated_at:
+        cache.delete(post_card_cache_key(post))
+
+
+@receiver(pre_save, sender=Post)
+def forget_previous_post_card(sender, instance, raw=False, **kwargs):
+    if not raw:
+        forget_post_card(instance)
+
+
+@receiver(pre_save, sender=Post)
+def touch_saved_post(sender, instance, raw=False, **kwargs):
+    # После forget_previous_post_card: та удаляет карточку по старому
+    # updated_at. Фикстуры сохраняют время из файла.
+    if not raw:
+        instance.updated_at = timezone.now()
+
+
+@receiver(post_delete, sender=Post)
+def forget_deleted_post_card(sender, instance, **kwargs):
+    forget_post_card(instance)
+
+
+@receiver(post_save, sender=Post)
+def sync_loaded_post(sender, instance, raw=False, **kwargs):
+    # Фикстуры (loaddata) сохраняют пост в обход Post.save(), поэтому
+    # видимость и счётчик комментариев доводятся здесь.
+    if not raw:
+        return
+    visibility = instance.actual_visibility()
+    Post.objects.filter(pk=instance.pk).exclude(
+        visibility=visibility).update(visibility=visibility)
+    Post.objects.filter(pk=instance.pk).recount_comments()
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, **kwargs):
+    search.index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, **kwargs):
+    search.remove_post(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        # Фикстура может перезаписать уже существующий комментарий,
+        # поэтому счётчик пересчитывается, а не увеличивается.
+        Post.objects.filter(pk=instance.post_id).recount_comments()
+    elif created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1,
+            updated_at=timezone.now()
+        )
+    else:
+        # Правка комментария меняет страницу поста (и её ETag).
+        Post.objects.filter(pk=instance.post_id).update(
+            updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1,
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_posts(sender, instance, raw=False, **kwargs):
+    # Карточка показывает название и статус категории, поэтому её
+    # изменение сдвигает версию карточек всех постов категории.
+    if not raw:
+        Post.objects.filter(category=instance).update(
+            updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Location)
+@receiver(pre_delete, sender=Location)
+def touch_location_posts(sender, instance, raw=False, **kwargs):
+    if not raw:
+        Post.objects.filter(location=instance).update(
+            updated_at=timezone.now())
+
+
+@receiver(post_save, sender=User)
+def touch_author_posts(
+        sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Вход пользователя сохраняет только last_login — карточки не меняются.
+    if created or raw:
+        return
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    Post.objects.filter(
+        Q(author=instance) | Q(comments__author=instance)
+    ).update(updated_at=timezone.now())
+    page_cache.invalidate()
+    feeds.invalidate()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def forget_cached_pages(sender, raw=False, **kwargs):
+    if not raw:
+        page_cache.invalidate()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def forget_cached_feeds(sender, raw=False, **kwargs):
+    # Комментарии в ленты не попадают и кеш лент не сбрасывают.
+    if not raw:
+        feeds.invalidate()
+
+
+@receiver(posts_published)
+def forget_published_pages(sender, category_ids, **kwargs):
+    page_cache.invalidate()
+    feeds.invalidate()
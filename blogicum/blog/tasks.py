@@ -0,0 +1,44 @@
+from django.utils import timezone
+from PIL import Image
+
+from blog.models import Post
+from blog.thumbnails import generate_thumbnails, normalize_image
+from core import page_cache
+from core.tasks import register
+
+PROCESS_POST_IMAGE = 'blog.process_post_image'
+
+
+def _finish_processing(post_id, original, image_name):
+    # update() вместо save(): сигналы поиска и кеша карточек здесь не нужны,
+    # а новая версия updated_at сбрасывает закешированную карточку. Если
+    # автор успел заменить картинку, запись пропускается: новую обработает
+    # её собственная задача.
+    if Post.objects.filter(pk=post_id, image=original).update(
+        image=image_name,
+        image_processing=False,
+        updated_at=timezone.now()
+    ):
+        page_cache.invalidate()
+
+
+@register(PROCESS_POST_IMAGE)
+def process_post_image(post_id):
+    post = Post.objects.filter(pk=post_id).only('image').first()
+    if post is None:
+        return
+    original = post.image.name
+    if post.image:
+        try:
+            try:
+                post.image.name = normalize_image(post.image)
+            except (OSError, Image.DecompressionBombError):
+                # Оригинал остаётся как есть; копии создадутся, если возможно.
+                pass
+            generate_thumbnails(post.image)
+        except Exception:
+            # Повтор задачи выполнит только `run_jobs`; до тех пор пост
+            # показывается с исходной картинкой, а не «обрабатывается».
+            _finish_processing(post_id, original, post.image.name)
+            raise
+    _finish_processing(post_id, original, post.image.name)
@@ -0,0 +1,11 @@
+from django import template
+
+from blog import thumbnails
+
+register = template.Library()
+
+
+@register.simple_tag
+def thumbnail_url(image, size):
+    """URL уменьшенной копии или оригинала, пока копии ещё нет."""
+    return thumbnails.thumbnail_url(image, size)
@@ -0,0 +1,79 @@
+"""Уменьшенные копии изображений публикаций.
+
+Для каждого размера из settings.POST_THUMBNAIL_SIZES рядом с оригиналом
+сохраняется WebP-файл `<имя>.<размер>.webp`.
+"""
+import logging
+import posixpath
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+
+def thumbnail_name(name, size):
+    root, _ = posixpath.splitext(name)
+    return f'{root}.{size}.webp'
+
+
+def has_thumbnails(image):
+    return all(
+        image.storage.exists(thumbnail_name(image.name, size))
+        for size in settings.POST_THUMBNAIL_SIZES
+    )
+
+
+def generate_thumbnails(image):
+    """Создаёт все размеры; возвращает имена сохранённых файлов."""
+    try:
+        with image.open('rb') as source:
+            original = ImageOps.exif_transpose(Image.open(source))
+            original.load()
+    except (OSError, Image.DecompressionBombError):
+        logger.exception('Не удалось открыть изображение %s', image.name)
+        return []
+    if original.mode not in ('RGB', 'RGBA'):
+        original = original.convert('RGBA' if 'A' in original.mode else 'RGB')
+    names = []
+    for size, box in settings.POST_THUMBNAIL_SIZES.items():
+        thumbnail = original.copy()
+        thumbnail.thumbnail(box)
+        buffer = BytesIO()
+        thumbnail.save(
+            buffer, 'WEBP', quality=settings.POST_THUMBNAIL_QUALITY)
+        name = thumbnail_name(image.name, size)
+        image.storage.delete(name)
+        names.append(image.storage.save(name, ContentFile(buffer.getvalue())))
+    return names
+
+
+def normalize_image(image):
+    """Поворачивает по EXIF и пересохраняет оригинал без метаданных.
+
+    Возвращает имя сохранённого файла (хранилище может его изменить).
+    """
+    with image.open('rb') as source:
+        original = Image.open(source)
+        image_format = original.format
+        if getattr(original, 'is_animated', False):
+            return image.name
+        normalized = ImageOps.exif_transpose(original)
+        normalized.load()
+    if image_format == 'JPEG' and normalized.mode not in ('RGB', 'L'):
+        normalized = normalized.convert('RGB')
+    buffer = BytesIO()
+    # Без параметра exif Pillow не переносит метаданные в новый файл.
+    normalized.save(buffer, image_format)
+    name = image.name
+    image.storage.delete(name)
+    return image.storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def thumbnail_url(image, size):
+    name = thumbnail_name(image.name, size)
+    if image.storage.exists(name):
+        return image.storage.url(name)
+    return image.url
@@ -1,17 +1,33 @@
+from django.conf import settings
 from django.urls import path
-from blog import views
+from blog import feeds, views, views_async
 
 app_name = 'blog'
 
+# Страницы для чтения можно обслуживать асинхронными view (ASGI).
+read_views = views_async if settings.BLOG_ASYNC_VIEWS else views
+
 urlpatterns = [
-    path('', views.index, name='index'),
+    path('', read_views.index, name='index'),
     path('category/<slug:category_slug>/',
-         views.category_posts, name='category_posts'),
-    path('profile/<str:username>/', views.profile, name='profile'),
+         read_views.category_posts, name='category_posts'),
+    path('profile/<str:username>/', read_views.profile, name='profile'),
+    path('feeds/rss/', feeds.latest_rss, name='feed_rss'),
+    path('feeds/atom/', feeds.latest_atom, name='feed_atom'),
+    path('category/<slug:category_slug>/rss/',
+         feeds.category_rss, name='category_feed_rss'),
+    path('category/<slug:category_slug>/atom/',
+         feeds.category_atom, name='category_feed_atom'),
+    path('profile/<str:username>/rss/',
+         feeds.author_rss, name='profile_feed_rss'),
+    path('profile/<str:username>/atom/',
+         feeds.author_atom, name='profile_feed_atom'),
+    path('search/', views.search, name='search'),
+    path('export/', views.export, name='export'),
     path('edit_profile/', views.edit_profile, name='edit_profile'),
     path('password_change/', views.password_change, name='password_change'),
     path('posts/create/', views.create_post, name='create_post'),
-    path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path('posts/<int:post_id>/', read_views.post_detail, name='post_detail'),
     path('posts/<int:post_id>/edit/', views.edit_post, name='edit_post'),
     path('posts/<int:post_id>/delete/', views.delete_post, name='delete_post'),
     path('posts/<int:post_id>/comment/', views.add_comment, name='add_comment'),
@@ -1,38 +1,54 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
-from django.db.models import Count
-from django.http import HttpResponseForbidden
+from django.db import transaction
+from django.http import (
+    HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+)
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils import timezone
-import sys
-
-from blog.forms import CommentForm, PasswordChangeForm, PostForm, ProfileForm
+from django.utils.http import urlencode
+import logging
+
+from blog.conditional import (
+    category_validators, conditional_page, index_validators, post_validators
+)
+from blog.export import export_posts, iter_ndjson
+from blog.forms import (
+    CommentForm, ExportForm, PasswordChangeForm, PostForm, ProfileForm
+)
 from blog.models import Category, Comment, Post
-from blogicum.settings import POSTS_PER_PAGE
+from blog.listings import category_post_ids
+from blog.pagination import (
+    get_comments_page, get_id_page_obj, get_page_obj, is_cursor_mode
+)
+from blog.search import search_posts
+from blog.tasks import PROCESS_POST_IMAGE
+from core.tasks import enqueue
+
+logger = logging.getLogger(__name__)
 
 
+@conditional_page(index_validators)
 def index(request):
-    posts = Post.objects.filter(
-        is_published=True,
-        category__is_published=True,
-        pub_date__lte=timezone.now()
-    ).annotate(comment_count=Count('comments')).order_by('-pub_date')
-    paginator = Paginator(posts, POSTS_PER_PAGE)
-    page_obj = paginator.get_page(request.GET.get('page'))
+    posts = Post.objects.published().with_feed_relations()
+    page_obj = get_page_obj(request, posts)
     return render(request, 'blog/index.html', {'page_obj': page_obj})
 
 
+@conditional_page(category_validators)
 def category_posts(request, category_slug):
     category = get_object_or_404(
         Category, slug=category_slug, is_published=True)
-    posts = category.posts.filter(
-        is_published=True,
-        pub_date__lte=timezone.now()
-    ).annotate(comment_count=Count('comments')).order_by('-pub_date')
-    paginator = Paginator(posts, POSTS_PER_PAGE)
-    page_obj = paginator.get_page(request.GET.get('page'))
+    posts = category.posts.published().with_feed_relations()
+    if is_cursor_mode(request):
+        page_obj = get_page_obj(request, posts)
+    else:
+        post_ids = category_post_ids(
+            category, getattr(request, 'feed_state', None))
+        page_obj = get_id_page_obj(request, post_ids, posts)
     return render(request, 'blog/category.html', {'category': category, 'page_obj': page_obj})
 
 
@@ -40,18 +56,38 @@ def profile(request, username):
     profile = get_object_or_404(User, username=username)
     posts = profile.posts.all()
     if request.user != profile:
-        posts = posts.filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lte=timezone.now()
-        )
-    posts = posts.annotate(comment_count=Count(
-        'comments')).order_by('-pub_date')
-    paginator = Paginator(posts, POSTS_PER_PAGE)
-    page_obj = paginator.get_page(request.GET.get('page'))
+        posts = posts.published()
+    posts = posts.with_feed_relations()
+    page_obj = get_page_obj(request, posts)
     return render(request, 'blog/profile.html', {'profile': profile, 'page_obj': page_obj})
 
 
+def search(request):
+    query = request.GET.get('q', '').strip()
+    posts = search_posts(query) if query else Post.objects.none()
+    # Рейтинг задаёт порядок, поэтому здесь только постраничный режим.
+    paginator = Paginator(posts, settings.POSTS_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    return render(request, 'blog/search.html', {
+        'query': query,
+        'page_obj': page_obj,
+        'page_query': urlencode({'q': query}) + '&',
+    })
+
+
+@staff_member_required
+def export(request):
+    form = ExportForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    response = StreamingHttpResponse(
+        iter_ndjson(export_posts(**form.cleaned_data)),
+        content_type='application/x-ndjson; charset=utf-8',
+    )
+    response['Content-Disposition'] = 'attachment; filename="blog.ndjson"'
+    return response
+
+
 @login_required
 def password_change(request):
     if request.method == 'POST':
@@ -63,7 +99,8 @@ def password_change(request):
             return redirect('blog:profile', username=request.user.username)
     else:
         form = PasswordChangeForm()
-    return render(request, 'blog/password_change_form.html', {'form': form})
+    return render(
+        request, 'registration/password_change_form.html', {'form': form})
 
 
 @login_required
@@ -85,24 +122,34 @@ def create_post(request):
         if form.is_valid():
             post = form.save(commit=False)
             post.author = request.user
+            post.image_processing = bool(post.image)
             post.save()
+            if post.image:
+                enqueue(PROCESS_POST_IMAGE, post_id=post.pk)
             return redirect('blog:profile', username=request.user.username)
     else:
         form = PostForm()
     return render(request, 'blog/create.html', {'form': form})
 
 
+@conditional_page(post_validators)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author', 'category', 'location'),
+        pk=post_id
+    )
     if request.user != post.author:
-        if not post.is_published or not post.category.is_published or post.pub_date > timezone.now():
+        if (post.visibility != Post.VISIBLE
+                or not post.category.is_published):
             return render(request, 'pages/404.html', status=404)
     form = CommentForm()
-    comments = post.comments.all().order_by('created_at')
-    print(f"post_detail: User={request.user.username if request.user.is_authenticated else 'Anonymous'}, "
-          f"UserID={request.user.id if request.user.is_authenticated else 'None'}, "
-          f"PostID={post.id}, "
-          f"Comments={[(c.id, c.author.username, c.author.id) for c in comments]}", file=sys.stderr)  # Отладка
+    comments = get_comments_page(request, post)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            'post_detail: user_id=%s post_id=%s comments=%s',
+            request.user.pk, post.pk,
+            [(c.id, c.author_id) for c in comments]
+        )
     return render(request, 'blog/detail.html', {
         'post': post,
         'form': form,
@@ -118,7 +165,12 @@ def edit_post(request, post_id):
     if request.method == 'POST':
         form = PostForm(request.POST, request.FILES, instance=post)
         if form.is_valid():
+            image_changed = 'image' in form.changed_data and post.image
+            if image_changed:
+                post.image_processing = True
             form.save()
+            if image_changed:
+                enqueue(PROCESS_POST_IMAGE, post_id=post.pk)
             return redirect('blog:post_detail', post_id=post_id)
     else:
         form = PostForm(instance=post)
@@ -143,15 +195,18 @@ def add_comment(request, post_id):
         form = CommentForm(request.POST)
         if form.is_valid():
             if not request.user.is_authenticated:
-                print("add_comment: User not authenticated",
-                      file=sys.stderr)  # Отладка
+                logger.warning('add_comment: анонимный запрос к post_id=%s',
+                               post_id)
                 return redirect('blog:post_detail', post_id=post_id)
             comment = form.save(commit=False)
             comment.author = request.user
             comment.post = post
-            comment.save()
-            print(f"add_comment: Created comment by {comment.author.username} (ID={comment.author.id}) "
-                  f"for post {post_id}, CommentID={comment.id}, PostID={post.id}", file=sys.stderr)  # Отладка
+            with transaction.atomic():
+                comment.save()
+            logger.debug(
+                'add_comment: comment_id=%s post_id=%s author_id=%s',
+                comment.pk, post.pk, comment.author_id
+            )
             return redirect('blog:post_detail', post_id=post_id)
     return redirect('blog:post_detail', post_id=post_id)
 
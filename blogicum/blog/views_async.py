@@ -0,0 +1,96 @@
+"""Асинхронные (ASGI) варианты страниц для чтения.
+
+Данные загружаются асинхронным ORM, а шаблон рендерится через
+sync_to_async: контекстные процессоры обращаются к request.user
+синхронно. Подключаются вместо синхронных view настройкой
+BLOG_ASYNC_VIEWS.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.shortcuts import aget_object_or_404, render
+
+from blog.conditional import (
+    category_validators, conditional_page, index_validators, post_validators
+)
+from blog.forms import CommentForm
+from blog.models import Category, Post
+from blog.listings import category_post_ids
+from blog.pagination import (
+    aget_comments_page, aget_id_page_obj, aget_page_obj, is_cursor_mode
+)
+
+logger = logging.getLogger(__name__)
+
+_render = sync_to_async(render)
+acategory_post_ids = sync_to_async(category_post_ids)
+
+
+async def arender(request, *args, **kwargs):
+    # Контекстные процессоры читают request.user синхронно; подставляем
+    # уже загруженного через auser() пользователя, чтобы не искать его
+    # в базе второй раз.
+    request.user = await request.auser()
+    return await _render(request, *args, **kwargs)
+
+
+@conditional_page(index_validators)
+async def index(request):
+    posts = Post.objects.published().with_feed_relations()
+    page_obj = await aget_page_obj(request, posts)
+    return await arender(request, 'blog/index.html', {'page_obj': page_obj})
+
+
+@conditional_page(category_validators)
+async def category_posts(request, category_slug):
+    category = await aget_object_or_404(
+        Category, slug=category_slug, is_published=True)
+    posts = category.posts.published().with_feed_relations()
+    if is_cursor_mode(request):
+        page_obj = await aget_page_obj(request, posts)
+    else:
+        post_ids = await acategory_post_ids(
+            category, getattr(request, 'feed_state', None))
+        page_obj = await aget_id_page_obj(request, post_ids, posts)
+    return await arender(request, 'blog/category.html', {
+        'category': category,
+        'page_obj': page_obj
+    })
+
+
+async def profile(request, username):
+    profile = await aget_object_or_404(User, username=username)
+    posts = profile.posts.all()
+    if await request.auser() != profile:
+        posts = posts.published()
+    posts = posts.with_feed_relations()
+    page_obj = await aget_page_obj(request, posts)
+    return await arender(request, 'blog/profile.html', {
+        'profile': profile,
+        'page_obj': page_obj
+    })
+
+
+@conditional_page(post_validators)
+async def post_detail(request, post_id):
+    post = await aget_object_or_404(
+        Post.objects.select_related('author', 'category', 'location'),
+        pk=post_id
+    )
+    user = await request.auser()
+    if user != post.author:
+        if (post.visibility != Post.VISIBLE
+                or not post.category.is_published):
+            return await arender(request, 'pages/404.html', status=404)
+    comments = await aget_comments_page(request, post)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            'post_detail: user_id=%s post_id=%s comments=%s',
+            user.pk, post.pk, [(c.id, c.author_id) for c in comments]
+        )
+    return await arender(request, 'blog/detail.html', {
+        'post': post,
+        'form': CommentForm(),
+        'comments': comments
+    })
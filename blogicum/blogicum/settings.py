@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -20,22 +21,36 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'core.page_cache.AnonymousPageCacheMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 POSTS_PER_PAGE = 10
+# Сколько последних постов отдают ленты RSS и Atom.
+FEED_SIZE = 20
+# Сколько секунд готовый XML ленты живёт в кеше.
+FEED_CACHE_TIMEOUT = 300
+# Асинхронные view лент и страницы поста (для запуска под ASGI).
+BLOG_ASYNC_VIEWS = os.getenv('BLOGICUM_ASYNC_VIEWS') == '1'
+# 'page' — нумерованные страницы, 'cursor' — пагинация по ключу.
+POSTS_PAGINATION = 'page'
+COMMENTS_PER_PAGE = 50
+# 'auto' — FTS5 на SQLite и обратный индекс SearchTerm на других СУБД.
+SEARCH_BACKEND = 'auto'
+SEARCH_MAX_RESULTS = 500
 ROOT_URLCONF = 'blogicum.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.metrics.InstrumentedDjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -51,12 +66,88 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
+# Профиль базы (BLOGICUM_DB_PROFILE): 'default' — SQLite как есть,
+# 'production' — WAL и PRAGMA из SQLITE_PRAGMAS (их выполняет core.db при
+# каждом новом соединении) и постоянные соединения.
+DATABASE_PROFILES = {
+    'default': {},
+    'production': {
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Транзакция сразу берёт блокировку записи: иначе при попытке
+            # перейти от чтения к записи она сразу получает
+            # "database is locked", не дожидаясь busy_timeout.
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+}
+DATABASE_PROFILE = os.getenv('BLOGICUM_DB_PROFILE', 'default')
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        **DATABASE_PROFILES[DATABASE_PROFILE],
     }
 }
+SQLITE_PRAGMAS = {
+    # Читатели не ждут писателя, а писатель — читателей.
+    'journal_mode': 'wal',
+    # В режиме WAL fsync нужен только при контрольной точке.
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение — размер в КиБ (64 МиБ на соединение).
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+} if DATABASE_PROFILE == 'production' else {}
+
+# Фоновые задачи: JOBS_EAGER выполняет их сразу, в том же потоке.
+# Упавшая задача возвращается в очередь, но повторяет её (до
+# JOBS_MAX_ATTEMPTS попыток) только `manage.py run_jobs --loop`.
+JOBS_EAGER = False
+JOBS_WORKERS = 2
+JOBS_MAX_ATTEMPTS = 3
+
+# Кеш: BLOGICUM_CACHE_BACKEND=locmem (по умолчанию) | file | dummy.
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+CACHE_BACKEND = os.getenv('BLOGICUM_CACHE_BACKEND', 'locmem')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.getenv(
+            'BLOGICUM_CACHE_LOCATION',
+            str(BASE_DIR / 'cache') if CACHE_BACKEND == 'file' else 'blogicum'
+        ),
+        'TIMEOUT': int(os.getenv('BLOGICUM_CACHE_TIMEOUT', 300)),
+        'KEY_PREFIX': 'blogicum',
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('BLOGICUM_CACHE_MAX_ENTRIES', 5000)),
+        },
+    }
+}
+
+# Метрики запросов (Server-Timing и /metrics/): BLOGICUM_METRICS=1.
+METRICS_ENABLED = os.getenv('BLOGICUM_METRICS') == '1'
+METRICS_BUFFER_SIZE = 1000
+
+# Кеш страниц для анонимов: BLOGICUM_PAGE_CACHE=0 отключает его.
+PAGE_CACHE_ENABLED = os.getenv('BLOGICUM_PAGE_CACHE', '1') == '1'
+PAGE_CACHE_TIMEOUT = 300
+PAGE_CACHE_VIEWS = (
+    'blog:index',
+    'blog:category_posts',
+    'blog:post_detail',
+    'pages:about',
+    'pages:rules',
+)
+PAGE_CACHE_QUERY_PARAMS = ('page', 'cursor', 'comments_page')
+
+# Срок жизни списка id постов категории (blog.listings), секунды.
+CATEGORY_LISTING_TIMEOUT = 600
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -65,6 +156,36 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
 ]
 
+# BLOGICUM_LOG_LEVEL=DEBUG включает отладочный вывод приложения blog.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'verbose': {
+            'format': '{asctime} {levelname} {name} {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'verbose',
+        },
+    },
+    # Обработчик только у логгеров проекта: у логгера django есть свой, и
+    # через корневой предупреждения django.request печатались бы дважды.
+    'loggers': {
+        'blog': {
+            'handlers': ['console'],
+            'level': os.getenv('BLOGICUM_LOG_LEVEL', 'INFO'),
+        },
+        'core': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+    },
+}
+
 LANGUAGE_CODE = 'ru-RU'
 TIME_ZONE = 'UTC'
 USE_I18N = True
@@ -75,9 +196,22 @@ STATICFILES_DIRS = [BASE_DIR / 'static_dev']
 STATIC_ROOT = BASE_DIR / 'static'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Уменьшенные копии изображений публикаций: имя размера -> (ширина, высота).
+POST_THUMBNAIL_SIZES = {
+    'card': (640, 640),
+    'detail': (1280, 1280),
+}
+POST_THUMBNAIL_QUALITY = 80
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+# Очередь исходящей почты: размер пачки, число попыток и базовая задержка
+# между ними в секундах (удваивается с каждой попыткой).
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+# Через сколько секунд письмо, зависшее в отправке, возвращается в очередь.
+EMAIL_OUTBOX_SENDING_TIMEOUT = 600
 
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'blog:index'
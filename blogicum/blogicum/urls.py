@@ -3,8 +3,9 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path, reverse_lazy
 from django.views.generic.edit import CreateView
-from django.core.mail import send_mail
 from blog.forms import CustomUserCreationForm
+from core.mail import queue_mail
+from core.views import metrics_summary
 
 app_name = 'blogicum'
 
@@ -17,12 +18,11 @@ class RegistrationView(CreateView):
     def form_valid(self, form):
         response = super().form_valid(form)
         user = form.instance
-        send_mail(
+        queue_mail(
             'Добро пожаловать!',
             'Спасибо за регистрацию на Блогикум.',
             'from@example.com',
             [user.email],
-            fail_silently=True,
         )
         return response
 
@@ -31,8 +31,10 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('blog.urls', namespace='blog')),
     path('pages/', include('pages.urls', namespace='pages')),
+    path('api/v1/', include('blog.api_urls', namespace='api')),
     path('auth/', include('django.contrib.auth.urls')),
     path('auth/registration/', RegistrationView.as_view(), name='registration'),
+    path('metrics/', metrics_summary, name='metrics'),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
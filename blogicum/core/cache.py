@@ -0,0 +1,58 @@
+"""Кеш с пространствами имён.
+
+Каждое пространство имён хранит свою версию; ключи строятся из неё, поэтому
+`bump_version()` одним инкрементом делает недоступными все ранее сохранённые
+значения пространства — их не нужно искать и удалять по одному.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+
+def _version_key(namespace):
+    return f'ns:{namespace}:version'
+
+
+def get_version(namespace):
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # Начальная версия из времени: если ключ версии вытеснен из кеша,
+        # старые значения не «оживут» под повторно выданным номером.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace):
+    try:
+        return cache.incr(_version_key(namespace))
+    except ValueError:
+        return get_version(namespace)
+
+
+def make_key(namespace, key, version=None):
+    if version is None:
+        version = get_version(namespace)
+    if isinstance(key, (tuple, list)):
+        key = ':'.join(str(part) for part in key)
+    digest = hashlib.md5(str(key).encode(), usedforsecurity=False)
+    return f'{namespace}:{version}:{digest.hexdigest()}'
+
+
+def get(namespace, key, default=None):
+    return cache.get(make_key(namespace, key), default)
+
+
+def set(namespace, key, value, timeout=DEFAULT_TIMEOUT):
+    cache.set(make_key(namespace, key), value, timeout)
+
+
+def get_or_set(namespace, key, default, timeout=DEFAULT_TIMEOUT):
+    return cache.get_or_set(make_key(namespace, key), default, timeout)
+
+
+def delete(namespace, key):
+    cache.delete(make_key(namespace, key))
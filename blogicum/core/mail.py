@@ -0,0 +1,114 @@
+"""Очередь исходящих писем.
+
+`queue_mail()` только сохраняет письмо и ставит фоновую задачу; отправка
+идёт пачками через одно соединение с почтовым бэкендом, неудачные письма
+повторяются с экспоненциальной задержкой.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import OutgoingEmail
+from core.tasks import enqueue, register
+
+logger = logging.getLogger(__name__)
+
+SEND_QUEUED_MAIL = 'core.send_queued_mail'
+
+
+def queue_mail(subject, message, from_email, recipient_list):
+    email = OutgoingEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email,
+        recipients=list(recipient_list),
+    )
+    enqueue(SEND_QUEUED_MAIL)
+    return email
+
+
+def _reschedule(email, error):
+    attempts = email.attempts + 1
+    failed = attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    OutgoingEmail.objects.filter(pk=email.pk).update(
+        status=OutgoingEmail.FAILED if failed else OutgoingEmail.PENDING,
+        attempts=attempts,
+        next_attempt_at=timezone.now() + timedelta(seconds=delay),
+        last_error=f'{type(error).__name__}: {error}'
+    )
+
+
+def _claim_batch(batch_size):
+    candidates = OutgoingEmail.objects.filter(
+        status=OutgoingEmail.PENDING, next_attempt_at__lte=timezone.now()
+    ).order_by('pk').values_list('pk', flat=True)[:batch_size]
+    batch = []
+    for email in OutgoingEmail.objects.filter(pk__in=list(candidates)):
+        # Письмо достаётся только тому обработчику, который сменил статус.
+        if OutgoingEmail.objects.filter(
+            pk=email.pk, status=OutgoingEmail.PENDING
+        ).update(status=OutgoingEmail.SENDING, claimed_at=timezone.now()):
+            batch.append(email)
+    return batch
+
+
+def requeue_stale_sending(older_than=None):
+    """Возвращает в очередь письма, отправка которых оборвалась."""
+    if older_than is None:
+        older_than = timedelta(seconds=settings.EMAIL_OUTBOX_SENDING_TIMEOUT)
+    # claimed_at пуст у писем, взятых в отправку до появления этого поля.
+    return OutgoingEmail.objects.filter(
+        Q(claimed_at__lt=timezone.now() - older_than)
+        | Q(claimed_at__isnull=True),
+        status=OutgoingEmail.SENDING,
+    ).update(status=OutgoingEmail.PENDING, claimed_at=None)
+
+
+@register(SEND_QUEUED_MAIL)
+def send_queued_mail(batch_size=None):
+    """Отправляет пачки писем, пока очередь не опустеет.
+
+    Возвращает количество отправленных писем.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    requeue_stale_sending()
+    sent = 0
+    while True:
+        batch = _claim_batch(batch_size)
+        if not batch:
+            return sent
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as error:
+            logger.exception('Почтовый бэкенд недоступен')
+            for email in batch:
+                _reschedule(email, error)
+            return sent
+        try:
+            for email in batch:
+                message = EmailMessage(
+                    email.subject, email.body, email.from_email,
+                    email.recipients, connection=connection
+                )
+                try:
+                    message.send()
+                except Exception as error:
+                    logger.warning('Не удалось отправить письмо %s: %s',
+                                   email.pk, error)
+                    _reschedule(email, error)
+                    continue
+                OutgoingEmail.objects.filter(pk=email.pk).update(
+                    status=OutgoingEmail.SENT,
+                    attempts=email.attempts + 1,
+                    sent_at=timezone.now(),
+                    last_error=''
+                )
+                sent += 1
+        finally:
+            connection.close()
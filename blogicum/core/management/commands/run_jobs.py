@@ -0,0 +1,36 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core.tasks import requeue_stale, run_pending
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи, ожидающие в очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval с.'
+        )
+        parser.add_argument('--interval', type=float, default=5)
+        parser.add_argument('--limit', type=int, default=None)
+        parser.add_argument(
+            '--requeue-after', type=int, default=10,
+            help=(
+                'Через сколько минут «зависшая» задача снова встаёт'
+                ' в очередь.'
+            )
+        )
+
+    def handle(self, *args, loop=False, interval=5, limit=None,
+               requeue_after=10, **options):
+        while True:
+            requeue_stale(timedelta(minutes=requeue_after))
+            done = run_pending(limit)
+            if done or not loop:
+                self.stdout.write(f'Выполнено задач: {done}')
+            if not loop:
+                return
+            time.sleep(interval)
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.mail import send_queued_mail
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящей почты.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval с.'
+        )
+        parser.add_argument('--interval', type=float, default=10)
+
+    def handle(self, *args, batch_size=None, loop=False, interval=10,
+               **options):
+        while True:
+            sent = send_queued_mail(batch_size)
+            if sent or not loop:
+                self.stdout.write(f'Отправлено писем: {sent}')
+            if not loop:
+                return
+            time.sleep(interval)
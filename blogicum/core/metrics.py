@@ -0,0 +1,140 @@
+"""Метрики запросов: число SQL-запросов, время SQL и шаблонов, размер ответа.
+
+Включаются настройкой METRICS_ENABLED (BLOGICUM_METRICS=1). Каждый ответ
+получает заголовок Server-Timing, а замеры складываются в кольцевой буфер
+последних METRICS_BUFFER_SIZE запросов каждой view; перцентили отдаёт
+страница /metrics/ (только для персонала).
+"""
+import math
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from threading import Lock
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+from django.template.backends.django import Template as DjangoTemplate
+
+FIELDS = ('total_ms', 'queries', 'sql_ms', 'template_ms', 'size')
+PERCENTILES = (50, 95, 99)
+
+_current = ContextVar('metrics_sample', default=None)
+_buffers = defaultdict(lambda: deque(maxlen=settings.METRICS_BUFFER_SIZE))
+_lock = Lock()
+
+
+class Sample:
+    def __init__(self):
+        self.total_ms = 0
+        self.queries = 0
+        self.sql_ms = 0
+        self.template_ms = 0
+        self.size = 0
+        self.rendering = False
+
+
+class _TimedTemplate(DjangoTemplate):
+    def render(self, context=None, request=None):
+        sample = _current.get()
+        # Вложенные render_to_string уже входят во внешний замер.
+        if sample is None or sample.rendering:
+            return super().render(context, request)
+        sample.rendering = True
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            sample.template_ms += (time.perf_counter() - started) * 1000
+            sample.rendering = False
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates, замеряющий время рендеринга для метрик."""
+
+    def from_string(self, template_code):
+        return _TimedTemplate(
+            super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return _TimedTemplate(
+            super().get_template(template_name).template, self)
+
+
+def _record_sql(sample):
+    def wrapper(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            sample.queries += 1
+            sample.sql_ms += (time.perf_counter() - started) * 1000
+    return wrapper
+
+
+def _server_timing(sample):
+    return ', '.join((
+        f'db;dur={sample.sql_ms:.1f};desc="{sample.queries} queries"',
+        f'tpl;dur={sample.template_ms:.1f}',
+        f'total;dur={sample.total_ms:.1f}',
+    ))
+
+
+def record(view_name, sample):
+    with _lock:
+        _buffers[view_name].append(
+            tuple(getattr(sample, field) for field in FIELDS))
+
+
+def reset():
+    with _lock:
+        _buffers.clear()
+
+
+def _percentile(values, percent):
+    # Ближайший ранг: значение, не меньшее percent% замеров.
+    return values[max(math.ceil(len(values) * percent / 100) - 1, 0)]
+
+
+def summary():
+    with _lock:
+        buffers = {name: list(samples) for name, samples in _buffers.items()}
+    result = {}
+    for view_name, samples in sorted(buffers.items()):
+        stats = {'count': len(samples)}
+        for index, field in enumerate(FIELDS):
+            values = sorted(sample[index] for sample in samples)
+            stats[field] = {
+                f'p{percent}': round(_percentile(values, percent), 2)
+                for percent in PERCENTILES
+            }
+        result[view_name] = stats
+    return result
+
+
+class MetricsMiddleware:
+    """Ставится первым, чтобы время включало остальные middleware."""
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sample = Sample()
+        token = _current.set(sample)
+        started = time.perf_counter()
+        try:
+            with connections['default'].execute_wrapper(_record_sql(sample)):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        sample.total_ms = (time.perf_counter() - started) * 1000
+        if not response.streaming:
+            sample.size = len(response.content)
+        response.headers['Server-Timing'] = _server_timing(sample)
+        match = request.resolver_match
+        if match is not None:
+            record(match.view_name, sample)
+        return response
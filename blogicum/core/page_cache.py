@@ -0,0 +1,106 @@
+"""Кеш целых страниц для анонимных читателей.
+
+Страницы из settings.PAGE_CACHE_VIEWS кешируются по пути и параметрам
+пагинации. Вошедшие пользователи и запросы с flash-сообщениями идут мимо
+кеша. Токен CSRF в сохранённой странице заменяется заглушкой и
+подставляется заново при каждой выдаче. `invalidate()` сбрасывает все
+страницы разом (сдвигом версии пространства имён core.cache).
+"""
+import re
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import parse_http_date_safe
+
+from core import cache
+
+NAMESPACE = 'pages'
+CSRF_PLACEHOLDER = b'__page_cache_csrf_token__'
+CSRF_TOKEN_RE = re.compile(rb'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control')
+
+
+def invalidate():
+    cache.bump_version(NAMESPACE)
+
+
+def _cache_key(request):
+    params = sorted(
+        (name, request.GET[name])
+        for name in settings.PAGE_CACHE_QUERY_PARAMS if name in request.GET
+    )
+    return (request.path, params)
+
+
+def _is_private(response):
+    cache_control = response.get('Cache-Control', '')
+    return 'private' in cache_control or 'no-store' in cache_control
+
+
+class AnonymousPageCacheMiddleware(MiddlewareMixin):
+    """Ставится после AuthenticationMiddleware и MessageMiddleware."""
+
+    def _is_cacheable(self, request, view_name):
+        return (
+            settings.PAGE_CACHE_ENABLED
+            and request.method in ('GET', 'HEAD')
+            and view_name in settings.PAGE_CACHE_VIEWS
+            and not request.user.is_authenticated
+            and CookieStorage.cookie_name not in request.COOKIES
+        )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self._is_cacheable(request, request.resolver_match.view_name):
+            return None
+        request.page_cache_key = _cache_key(request)
+        cached = cache.get(NAMESPACE, request.page_cache_key)
+        if cached is None:
+            return None
+        request.page_cache_hit = True
+        return self._from_cache(request, cached)
+
+    def _from_cache(self, request, cached):
+        headers = cached['headers']
+        response = get_conditional_response(
+            request,
+            etag=headers.get('ETag'),
+            last_modified=parse_http_date_safe(
+                headers.get('Last-Modified', '')),
+        )
+        if response is None:
+            content = cached['content']
+            if CSRF_PLACEHOLDER in content:
+                content = content.replace(
+                    CSRF_PLACEHOLDER, get_token(request).encode())
+            response = HttpResponse(content, status=cached['status'])
+        for name, value in headers.items():
+            response.headers[name] = value
+        response.headers['X-Page-Cache'] = 'hit'
+        patch_vary_headers(response, ('Cookie',))
+        return response
+
+    def process_response(self, request, response):
+        key = getattr(request, 'page_cache_key', None)
+        if key is None or getattr(request, 'page_cache_hit', False):
+            return response
+        # Страницы с собственными cookie не кешируются; cookie CSRF при
+        # выдаче из кеша выставит CsrfViewMiddleware.
+        if (response.status_code != 200 or response.streaming
+                or set(response.cookies) - {settings.CSRF_COOKIE_NAME}
+                or _is_private(response)):
+            return response
+        cache.set(NAMESPACE, key, {
+            'status': response.status_code,
+            'content': CSRF_TOKEN_RE.sub(
+                rb'\g<1>' + CSRF_PLACEHOLDER + rb'\g<2>', response.content),
+            'headers': {
+                name: response.headers[name]
+                for name in CACHED_HEADERS if response.has_header(name)
+            },
+        }, settings.PAGE_CACHE_TIMEOUT)
+        response.headers['X-Page-Cache'] = 'miss'
+        return response
@@ -0,0 +1,107 @@
+"""Фоновые задачи внутри процесса.
+
+Задача сначала записывается в таблицу Job и только после фиксации
+транзакции передаётся пулу потоков, поэтому запрос не ждёт её выполнения,
+а невыполненные задачи переживают перезапуск: их подбирает
+`manage.py run_jobs`.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+from threading import Lock
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import Job
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+_executor = None
+_executor_lock = Lock()
+
+
+def register(name):
+    def decorator(handler):
+        _handlers[name] = handler
+        return handler
+    return decorator
+
+
+def enqueue(name, **payload):
+    if name not in _handlers:
+        raise KeyError(f'Неизвестная фоновая задача: {name}')
+    job = Job.objects.create(name=name, payload=payload)
+    if settings.JOBS_EAGER:
+        run_job(job.pk)
+    else:
+        transaction.on_commit(partial(_submit, job.pk))
+    return job
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.JOBS_WORKERS,
+                thread_name_prefix='blogicum-jobs'
+            )
+    return _executor
+
+
+def _submit(job_id):
+    _get_executor().submit(_run_in_worker, job_id)
+
+
+def _run_in_worker(job_id):
+    close_old_connections()
+    try:
+        run_job(job_id)
+    finally:
+        close_old_connections()
+
+
+def run_job(job_id):
+    """Выполняет задачу, если её ещё никто не забрал."""
+    claimed = Job.objects.filter(pk=job_id, status=Job.PENDING).update(
+        status=Job.RUNNING,
+        attempts=F('attempts') + 1,
+        updated_at=timezone.now()
+    )
+    if not claimed:
+        return False
+    job = Job.objects.get(pk=job_id)
+    try:
+        _handlers[job.name](**job.payload)
+    except Exception as error:
+        logger.exception('Фоновая задача %s завершилась ошибкой', job)
+        failed = job.attempts >= settings.JOBS_MAX_ATTEMPTS
+        Job.objects.filter(pk=job_id).update(
+            status=Job.FAILED if failed else Job.PENDING,
+            last_error=f'{type(error).__name__}: {error}',
+            updated_at=timezone.now()
+        )
+        return False
+    Job.objects.filter(pk=job_id).update(
+        status=Job.DONE, last_error='', updated_at=timezone.now())
+    return True
+
+
+def requeue_stale(older_than=timedelta(minutes=10)):
+    """Возвращает в очередь задачи, прерванные остановкой процесса."""
+    return Job.objects.filter(
+        status=Job.RUNNING, updated_at__lt=timezone.now() - older_than
+    ).update(status=Job.PENDING, updated_at=timezone.now())
+
+
+def run_pending(limit=None):
+    job_ids = Job.objects.filter(status=Job.PENDING).order_by(
+        'pk').values_list('pk', flat=True)
+    if limit:
+        job_ids = job_ids[:limit]
+    return sum(run_job(job_id) for job_id in list(job_ids))
@@ -0,0 +1,10 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+from core import metrics
+
+
+@staff_member_required
+def metrics_summary(request):
+    return JsonResponse(
+        metrics.summary(), json_dumps_params={'ensure_ascii': False})
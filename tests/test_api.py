@@ -0,0 +1,139 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog import api
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = 25
+
+
+@pytest.fixture
+def api_posts(mixer: Mixer, user, published_category, published_location):
+    now = timezone.now()
+    posts = mixer.cycle(N_POSTS).blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location, is_published=True,
+        pub_date=(now - timezone.timedelta(hours=i) for i in range(N_POSTS)),
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, pub_date=now,
+    )
+    return posts
+
+
+def _walk(client, url, **params):
+    ids, cursor = [], None
+    while True:
+        if cursor:
+            params["cursor"] = cursor
+        data = client.get(url, params).json()
+        ids += [item["id"] for item in data["results"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_posts_cursor_walks_published_feed(client, api_posts):
+    expected = [post.id for post in api_posts]
+    assert _walk(client, "/api/v1/posts/") == expected, (
+        "Убедитесь, что курсор API проходит все опубликованные посты"
+        " от новых к старым без пропусков и повторов."
+    )
+    first = client.get("/api/v1/posts/").json()
+    second = client.get(
+        "/api/v1/posts/", {"cursor": first["next_cursor"]}).json()
+    back = client.get(
+        "/api/v1/posts/", {"cursor": second["previous_cursor"]}).json()
+    assert back["results"] == first["results"]
+
+
+def test_sparse_fieldsets_narrow_sql(client, api_posts):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get("/api/v1/posts/", {"fields": "id,title"})
+    item = response.json()["results"][0]
+    assert set(item) == {"id", "title"}
+    assert len(ctx.captured_queries) == 1
+    sql = ctx.captured_queries[0]["sql"]
+    assert '"text"' not in sql and "auth_user" not in sql, (
+        "Убедитесь, что ?fields= сужает список столбцов запроса через only()."
+    )
+
+    with CaptureQueriesContext(connection) as ctx:
+        data = client.get(
+            "/api/v1/posts/", {"fields": "author,location"}).json()
+    assert len(ctx.captured_queries) == 1, (
+        "Убедитесь, что связанные поля выбираются одним запросом."
+    )
+    assert data["results"][0]["author"] == api_posts[0].author.username
+
+    for fields in ("password", ",", " , "):
+        response = client.get("/api/v1/posts/", {"fields": fields})
+        assert response.status_code == 400, (
+            f"Убедитесь, что ?fields={fields} без известных полей"
+            " возвращает ошибку 400."
+        )
+
+
+def test_unpublished_location_is_hidden(
+        client, mixer: Mixer, user, published_category,
+        published_location):
+    hidden = mixer.blend("blog.Location", is_published=False)
+    now = timezone.now()
+    for location, hours in ((published_location, 1), (hidden, 0)):
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            location=location, is_published=True,
+            pub_date=now - timezone.timedelta(hours=hours),
+        )
+    results = client.get(
+        "/api/v1/posts/", {"fields": "location"}).json()["results"]
+    assert results[0]["location"] is None, (
+        "Убедитесь, что API не раскрывает название неопубликованного"
+        " местоположения."
+    )
+    assert results[1]["location"] == published_location.name
+
+
+def test_category_posts(client, api_posts, mixer: Mixer, published_category):
+    other = mixer.blend(
+        "blog.Post", category=mixer.blend("blog.Category", is_published=True),
+        author=api_posts[0].author, is_published=True,
+        pub_date=timezone.now(),
+    )
+    url = f"/api/v1/categories/{published_category.slug}/posts/"
+    ids = _walk(client, url, fields="id")
+    assert other.id not in ids and len(ids) == N_POSTS
+    hidden = mixer.blend("blog.Category", is_published=False)
+    response = client.get(f"/api/v1/categories/{hidden.slug}/posts/")
+    assert response.status_code == 404
+    assert "error" in response.json()
+
+
+def test_post_comments(client, settings, api_posts, mixer: Mixer, user):
+    settings.COMMENTS_PER_PAGE = 3
+    post = api_posts[0]
+    comments = mixer.cycle(7).blend("blog.Comment", post=post, author=user)
+    url = f"/api/v1/posts/{post.id}/comments/"
+    assert _walk(client, url) == [comment.id for comment in comments], (
+        "Убедитесь, что комментарии отдаются от старых к новым."
+    )
+    hidden = mixer.blend(
+        "blog.Post", author=user, is_published=False, pub_date=timezone.now())
+    response = client.get(f"/api/v1/posts/{hidden.id}/comments/")
+    assert response.status_code == 404
+
+
+def test_serializers_agree(client, api_posts, monkeypatch):
+    fast = client.get("/api/v1/posts/").content
+    monkeypatch.setattr(api, "orjson", None)
+    plain = client.get("/api/v1/posts/").content
+    assert json.loads(fast) == json.loads(plain), (
+        "Убедитесь, что ответ не зависит от того, установлен ли orjson."
+    )
@@ -0,0 +1,103 @@
+import re
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.test import AsyncRequestFactory, RequestFactory
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog import views, views_async
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_posts(mixer: Mixer, user, published_category, published_location):
+    pub_date = timezone.now() - timezone.timedelta(days=1)
+    return mixer.cycle(N_PER_PAGE + 3).blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location, pub_date=pub_date,
+    )
+
+
+def _without_csrf(response):
+    # Токен CSRF в форме комментария меняется от запроса к запросу.
+    return re.sub(rb'name="csrfmiddlewaretoken" value="[^"]*"', b"",
+                  response.content)
+
+
+def _call_sync(view, path, user, **kwargs):
+    request = RequestFactory().get(path)
+    request.user = user
+    return view(request, **kwargs)
+
+
+def _call_async(view, path, user, **kwargs):
+    request = AsyncRequestFactory().get(path)
+    request.user = user
+
+    async def auser():
+        return user
+
+    request.auser = auser
+    return async_to_sync(view)(request, **kwargs)
+
+
+@pytest.mark.parametrize(
+    "view_name, kwargs",
+    [
+        ("index", {}),
+        ("category_posts", {"category_slug": "slug"}),
+        ("profile", {"username": "username"}),
+    ],
+)
+def test_async_feeds_match_sync(
+        feed_posts, user, published_category, view_name, kwargs):
+    kwargs = {
+        key: (published_category.slug if key == "category_slug"
+              else user.username)
+        for key in kwargs
+    }
+    for viewer in (AnonymousUser(), user):
+        sync_response = _call_sync(
+            getattr(views, view_name), "/", viewer, **kwargs)
+        async_response = _call_async(
+            getattr(views_async, view_name), "/", viewer, **kwargs)
+        assert async_response.status_code == sync_response.status_code == 200
+        assert async_response.content == sync_response.content, (
+            f"Убедитесь, что асинхронная страница `{view_name}` совпадает"
+            " с синхронной."
+        )
+
+
+def test_async_post_detail_hides_unpublished(
+        feed_posts, user, another_user):
+    post = feed_posts[0]
+    post.is_published = False
+    post.save()
+    response = _call_async(
+        views_async.post_detail, "/", another_user, post_id=post.id)
+    assert response.status_code == 404, (
+        "Убедитесь, что асинхронная страница поста скрывает"
+        " снятый с публикации пост от других пользователей."
+    )
+    response = _call_async(
+        views_async.post_detail, "/", user, post_id=post.id)
+    assert response.status_code == 200
+
+
+def test_async_post_detail_matches_sync(mixer: Mixer, feed_posts, user):
+    post = feed_posts[0]
+    mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    for viewer in (AnonymousUser(), user):
+        sync_response = _call_sync(
+            views.post_detail, "/", viewer, post_id=post.id)
+        async_response = _call_async(
+            views_async.post_detail, "/", viewer, post_id=post.id)
+        assert async_response.status_code == 200
+        assert _without_csrf(async_response) == _without_csrf(sync_response), (
+            "Убедитесь, что асинхронная страница поста совпадает"
+            " с синхронной."
+        )
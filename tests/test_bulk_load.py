@@ -0,0 +1,109 @@
+import json
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from blog.loading import iter_fixture
+
+pytestmark = [pytest.mark.django_db]
+
+DB_JSON = Path(__file__).resolve().parent.parent / "db.json"
+TIMESTAMP = "2020-01-01T00:00:00Z"
+
+
+def _ndjson(tmp_path, objects):
+    path = tmp_path / "fixture.jsonl"
+    path.write_text(
+        "".join(json.dumps(obj, ensure_ascii=False) + "\n" for obj in objects),
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def test_iter_fixture_survives_chunk_boundaries():
+    objects = json.loads(DB_JSON.read_text(encoding="utf-8"))
+    with open(DB_JSON, encoding="utf-8") as stream:
+        streamed = list(iter_fixture(stream, chunk_size=7))
+    assert streamed == objects, (
+        "Убедитесь, что массив JSON разбирается по частям без потерь,"
+        " даже когда объект разрезан границей куска."
+    )
+    lines = StringIO("\n".join(json.dumps(obj) for obj in objects[:3]))
+    assert list(iter_fixture(lines)) == objects[:3]
+
+
+def test_bulk_load_db_json(client, PostModel):
+    objects = json.loads(DB_JSON.read_text(encoding="utf-8"))
+    out = StringIO()
+    call_command("bulk_load", str(DB_JSON), batch_size=10, stdout=out)
+    assert "blog.Post: 39" in out.getvalue()
+    posts = [obj for obj in objects if obj["model"] == "blog.post"]
+    assert PostModel.objects.count() == len(posts)
+    categories = {
+        obj["pk"]: obj["fields"]["is_published"]
+        for obj in objects if obj["model"] == "blog.category"
+    }
+    expected = sum(
+        1 for post in posts
+        if post["fields"]["is_published"]
+        and categories[post["fields"]["category"]]
+    )
+    assert PostModel.objects.published().count() == expected, (
+        "Убедитесь, что после `bulk_load` видимость постов пересчитана."
+    )
+    assert client.get("/").status_code == 200
+
+    call_command("bulk_load", str(DB_JSON), stdout=StringIO())
+    assert PostModel.objects.count() == len(posts), (
+        "Убедитесь, что повторная загрузка перезаписывает объекты"
+        " с теми же pk, как loaddata."
+    )
+
+
+def test_bulk_load_orders_models_and_recounts(tmp_path, PostModel):
+    # Комментарии раньше постов, посты раньше категорий и авторов.
+    objects = [
+        {"model": "blog.comment", "pk": pk, "fields": {
+            "text": "Комментарий", "post": 1, "author": 1,
+            "created_at": TIMESTAMP,
+        }}
+        for pk in (1, 2, 3)
+    ] + [
+        {"model": "blog.post", "pk": 1, "fields": {
+            "title": "Пост", "text": "Текст", "pub_date": TIMESTAMP,
+            "is_published": True, "created_at": TIMESTAMP,
+            "author": 1, "category": 1, "location": None,
+        }},
+        {"model": "blog.category", "pk": 1, "fields": {
+            "title": "Категория", "description": "Описание",
+            "slug": "bulk", "is_published": True, "created_at": TIMESTAMP,
+        }},
+        {"model": "auth.user", "pk": 1, "fields": {
+            "username": "bulk", "password": "!", "date_joined": TIMESTAMP,
+        }},
+    ]
+    call_command(
+        "bulk_load", _ndjson(tmp_path, objects), batch_size=2,
+        stdout=StringIO(),
+    )
+    post = PostModel.objects.get(pk=1)
+    assert post.comment_count == 3, (
+        "Убедитесь, что `bulk_load` пересчитывает счётчики комментариев."
+    )
+    assert post.visibility == PostModel.VISIBLE
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bulk_load_rejects_dangling_keys(tmp_path):
+    # Пачки фиксируются сразу, поэтому нужна настоящая транзакция.
+    objects = [{"model": "blog.location", "pk": 1, "fields": {
+        "name": "Место", "is_published": True, "created_at": TIMESTAMP,
+    }}, {"model": "blog.comment", "pk": 1, "fields": {
+        "text": "Комментарий", "post": 404, "author": 404,
+        "created_at": TIMESTAMP,
+    }}]
+    with pytest.raises(CommandError):
+        call_command(
+            "bulk_load", _ndjson(tmp_path, objects), stdout=StringIO())
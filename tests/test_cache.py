@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from core import cache as ns_cache
+
+
+def test_cache_backend_settings():
+    assert {"locmem", "file"} <= set(settings.CACHE_BACKENDS)
+    assert settings.CACHES["default"]["BACKEND"] == (
+        settings.CACHE_BACKENDS[settings.CACHE_BACKEND]
+    ), "Убедитесь, что бэкенд кеша выбирается переменной окружения."
+
+
+def test_miss_then_hit():
+    assert ns_cache.get("test", "key") is None
+    ns_cache.set("test", "key", "value")
+    assert ns_cache.get("test", "key") == "value"
+    assert ns_cache.get("other", "key") is None
+
+
+def test_composite_keys():
+    ns_cache.set("test", ("feed", 1, "page", 2), "value")
+    assert ns_cache.get("test", ("feed", 1, "page", 2)) == "value"
+    assert ns_cache.get("test", ("feed", 1, "page", 3)) is None
+
+
+def test_get_or_set_calls_default_once():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "value"
+
+    assert ns_cache.get_or_set("test", "key", compute) == "value"
+    assert ns_cache.get_or_set("test", "key", compute) == "value"
+    assert len(calls) == 1
+
+
+def test_bump_version_invalidates_namespace():
+    ns_cache.set("test", "a", 1)
+    ns_cache.set("test", "b", 2)
+    ns_cache.set("other", "a", 3)
+    version = ns_cache.get_version("test")
+    assert ns_cache.bump_version("test") == version + 1
+    assert ns_cache.get("test", "a") is None
+    assert ns_cache.get("test", "b") is None
+    assert ns_cache.get("other", "a") == 3
+
+
+def test_lost_version_does_not_revive_old_values():
+    ns_cache.set("test", "a", 1)
+    old_version = ns_cache.get_version("test")
+    cache.delete("ns:test:version")
+    assert ns_cache.get_version("test") != old_version
+    assert ns_cache.get("test", "a") is None
+
+
+def test_delete():
+    ns_cache.set("test", "a", 1)
+    ns_cache.delete("test", "a")
+    assert ns_cache.get("test", "a") is None
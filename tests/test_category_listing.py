@@ -0,0 +1,100 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def disable_page_cache(settings):
+    settings.PAGE_CACHE_ENABLED = False
+
+
+@pytest.fixture
+def category_posts(mixer: Mixer, user, published_category, published_location):
+    now = timezone.now()
+    return [
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            location=published_location, is_published=True,
+            pub_date=now - timezone.timedelta(hours=i + 1),
+        )
+        for i in range(N_PER_PAGE + 2)
+    ]
+
+
+def _page_ids(client, category, **params):
+    response = client.get(f"/category/{category.slug}/", params)
+    assert response.status_code == 200
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_listing_is_built_once(client, published_category, category_posts):
+    expected = [post.id for post in category_posts]
+    assert _page_ids(client, published_category) == expected[:N_PER_PAGE]
+    with CaptureQueriesContext(connection) as ctx:
+        second_page = _page_ids(client, published_category, page=2)
+    assert second_page == expected[N_PER_PAGE:]
+    sql = " ".join(query["sql"] for query in ctx.captured_queries)
+    assert "MIN(" not in sql and "COUNT(*)" not in sql, (
+        "Убедитесь, что страница категории берёт список id из кеша"
+        " и не считает посты заново."
+    )
+
+
+def test_listing_follows_writes(
+        client, mixer: Mixer, another_category, published_category,
+        category_posts):
+    first, moved = category_posts[0], category_posts[1]
+    _page_ids(client, published_category)
+
+    first.delete()
+    moved.category = another_category
+    moved.save()
+    ids = _page_ids(client, published_category)
+    assert first.id not in ids and moved.id not in ids, (
+        "Убедитесь, что список постов категории обновляется"
+        " при удалении и переносе постов."
+    )
+    assert _page_ids(client, another_category) == [moved.id]
+
+
+def test_scheduled_post_appears_after_publication(
+        client, mixer: Mixer, monkeypatch, user, published_category,
+        category_posts):
+    publish_at = timezone.now() + timezone.timedelta(minutes=30)
+    scheduled = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, location=None, pub_date=publish_at,
+    )
+    assert scheduled.id not in _page_ids(client, published_category)
+    later = publish_at + timezone.timedelta(minutes=1)
+    monkeypatch.setattr(timezone, "now", lambda: later)
+    assert scheduled.id not in _page_ids(client, published_category)
+    call_command("publish_scheduled", stdout=StringIO())
+    assert _page_ids(client, published_category)[0] == scheduled.id, (
+        "Убедитесь, что после `publish_scheduled` отложенный пост"
+        " появляется в категории."
+    )
+
+
+def test_listing_follows_writes_without_signals(
+        client, published_category, category_posts):
+    # Так пишет в базу другой процесс: сигналы этого процесса не приходят.
+    hidden = category_posts[0]
+    _page_ids(client, published_category)
+    type(hidden).objects.filter(pk=hidden.pk).update(
+        is_published=False, visibility=hidden.HIDDEN,
+        updated_at=timezone.now(),
+    )
+    assert hidden.id not in _page_ids(client, published_category), (
+        "Убедитесь, что ключ кеша списка постов категории зависит"
+        " от состояния постов в базе, а не только от сигналов."
+    )
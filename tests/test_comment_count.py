@@ -0,0 +1,62 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(
+        mixer: Mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что счётчик комментариев публикации увеличивается при"
+        " добавлении комментария."
+    )
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что счётчик комментариев публикации уменьшается при"
+        " удалении комментария."
+    )
+
+
+def test_recount_comments_repairs_counters(
+        mixer: Mixer, post_with_published_location, CommentModel):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    CommentModel.objects.bulk_create([
+        CommentModel(post=post, author=post.author, text="bulk")
+    ])
+    post.refresh_from_db()
+    assert post.comment_count == 2
+    call_command("recount_comments", stdout=StringIO())
+    post.refresh_from_db()
+    assert post.comment_count == 3
+
+
+def test_post_page_lists_uncounted_comments(
+        client, post_with_published_location, CommentModel):
+    post = post_with_published_location
+    CommentModel.objects.bulk_create([
+        CommentModel(post=post, author=post.author, text=f"bulk {i}")
+        for i in range(3)
+    ])
+    response = client.get(f"/posts/{post.id}/")
+    assert len(response.context["comments"]) == 3, (
+        "Убедитесь, что страница поста показывает все комментарии, даже если"
+        " счётчик comment_count отстал."
+    )
+
+
+def test_feed_does_not_join_comments(client, post_with_published_location):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get("/")
+    assert not any(
+        "blog_comment" in query["sql"] for query in ctx.captured_queries
+    ), "Убедитесь, что лента публикаций не обращается к таблице комментариев."
@@ -0,0 +1,112 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _urls(post):
+    return (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/posts/{post.id}/",
+    )
+
+
+@override_settings(PAGE_CACHE_ENABLED=False)
+def test_unchanged_pages_return_not_modified(
+        client, post_with_published_location):
+    for url in _urls(post_with_published_location):
+        response = client.get(url)
+        assert response.status_code == 200
+        etag = response.headers.get("ETag")
+        assert etag, (
+            f"Убедитесь, что страница `{url}` отдаёт анонимам заголовок ETag."
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f"Убедитесь, что неизменившаяся страница `{url}` отдаёт 304."
+        )
+        assert len(ctx.captured_queries) == 1, (
+            "Убедитесь, что для ответа 304 выполняется один запрос"
+            " к базе данных."
+        )
+
+
+def test_if_modified_since_returns_not_modified(
+        client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    response = client.get(url)
+    response = client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response.headers["Last-Modified"])
+    assert response.status_code == 304
+
+
+@override_settings(PAGE_CACHE_ENABLED=False)
+def test_deleted_post_is_not_hidden_by_if_modified_since(
+        mixer: Mixer, client, user, post_with_published_location):
+    post = post_with_published_location
+    newest = mixer.blend(
+        "blog.Post", author=user, category=post.category, location=None,
+        is_published=True, pub_date=post.pub_date)
+    for url in ("/", f"/category/{post.category.slug}/"):
+        assert not client.get(url).has_header("Last-Modified"), (
+            f"Убедитесь, что лента `{url}` сверяется только по ETag:"
+            " удаление поста не сдвигает дату последнего изменения."
+        )
+    etag = client.get("/").headers["ETag"]
+    newest.delete()
+    far_future = "Fri, 01 Jan 2100 00:00:00 GMT"
+    for headers in ({"HTTP_IF_NONE_MATCH": etag},
+                    {"HTTP_IF_MODIFIED_SINCE": far_future}):
+        response = client.get("/", **headers)
+        assert response.status_code == 200
+        assert newest.title not in response.content.decode()
+
+
+def test_changes_invalidate_etag(
+        mixer: Mixer, client, user, post_with_published_location):
+    post = post_with_published_location
+    etags = {url: client.get(url).headers["ETag"] for url in _urls(post)}
+
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    for url in ("/", f"/posts/{post.id}/"):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+        assert response.status_code == 200, (
+            f"Убедитесь, что новый комментарий меняет ETag страницы `{url}`."
+        )
+        etags[url] = response.headers["ETag"]
+
+    comment.text = "Исправленный текст"
+    comment.save()
+    url = f"/posts/{post.id}/"
+    response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+    assert response.status_code == 200, (
+        "Убедитесь, что правка комментария меняет ETag страницы поста."
+    )
+
+    post.is_published = False
+    post.save()
+    for url in ("/", f"/category/{post.category.slug}/"):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etags.get(url))
+        assert response.status_code == 200, (
+            f"Убедитесь, что снятие поста с публикации меняет ETag"
+            f" страницы `{url}`."
+        )
+    response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == 404
+    assert not response.has_header("ETag")
+
+
+def test_no_validators_for_logged_in_users(
+        user_client, post_with_published_location):
+    for url in _urls(post_with_published_location):
+        response = user_client.get(url)
+        assert response.status_code == 200
+        assert not response.has_header("ETag"), (
+            "Убедитесь, что персональные страницы вошедших пользователей"
+            " не получают ETag."
+        )
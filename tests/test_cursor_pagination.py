@@ -0,0 +1,61 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from bs4 import BeautifulSoup
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _cursor_links(response):
+    soup = BeautifulSoup(response.content.decode("utf-8"), "html.parser")
+    links = {}
+    for link in soup.select("a.page-link"):
+        query = parse_qs(urlparse(link["href"]).query, keep_blank_values=True)
+        if "cursor" in query:
+            links[link.text.strip()] = query["cursor"][0]
+    return links
+
+
+@pytest.fixture
+def posts_with_same_pub_date(mixer: Mixer, user, published_category):
+    pub_date = timezone.now() - timezone.timedelta(days=1)
+    return mixer.cycle(N_PER_PAGE * 2 + 3).blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=pub_date, location=None,
+    )
+
+
+def test_cursor_walks_feed_forward_and_back(
+        client, posts_with_same_pub_date):
+    expected = sorted(
+        posts_with_same_pub_date, key=lambda p: p.id, reverse=True)
+    seen, cursor, pages = [], "", []
+    while cursor is not None:
+        response = client.get("/", {"cursor": cursor})
+        assert response.status_code == 200
+        page = response.context["page_obj"]
+        pages.append((cursor, [post.id for post in page]))
+        seen.extend(post.id for post in page)
+        cursor = page.next_cursor
+    assert seen == [post.id for post in expected], (
+        "Убедитесь, что пагинация по курсору выдаёт все публикации"
+        " по одному разу в порядке «от новых к старым»."
+    )
+    assert len(pages) == 3
+
+    previous_cursor = _cursor_links(client.get("/", {"cursor": pages[-1][0]}))
+    response = client.get("/", {"cursor": previous_cursor["<<"]})
+    assert [post.id for post in response.context["page_obj"]] == pages[1][1]
+
+
+def test_bad_cursor_falls_back_to_first_page(
+        client, posts_with_same_pub_date):
+    response = client.get("/", {"cursor": "not-a-cursor"})
+    assert response.status_code == 200
+    page = response.context["page_obj"]
+    assert len(page) == N_PER_PAGE
+    assert not page.has_previous()
@@ -0,0 +1,103 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def staff_client(client, mixer: Mixer):
+    client.force_login(mixer.blend("auth.User", is_staff=True))
+    return client
+
+
+@pytest.fixture
+def posts(mixer: Mixer, user, another_user, published_category):
+    now = timezone.now()
+    posts = mixer.cycle(6).blend(
+        "blog.Post",
+        author=(user if i % 2 else another_user for i in range(6)),
+        category=published_category, location=None,
+        pub_date=(now - timezone.timedelta(days=i) for i in range(6)),
+    )
+    mixer.cycle(4).blend("blog.Comment", post=posts[0], author=user)
+    return posts
+
+
+def _lines(response):
+    content = b"".join(response.streaming_content).decode()
+    return [json.loads(line) for line in content.splitlines()]
+
+
+def test_export_is_staff_only(client, user_client):
+    assert client.get("/export/").status_code == 302
+    assert user_client.get("/export/").status_code == 302
+
+
+def test_export_streams_posts_with_comments(staff_client, posts):
+    response = staff_client.get("/export/")
+    assert response.status_code == 200
+    assert response.streaming, (
+        "Убедитесь, что выгрузка отдаётся потоком (StreamingHttpResponse)."
+    )
+    assert response["Content-Type"].startswith("application/x-ndjson")
+    exported = {item["id"]: item for item in _lines(response)}
+    assert set(exported) == {post.id for post in posts}
+    first = exported[posts[0].id]
+    assert len(first["comments"]) == 4
+    assert first["author"] == posts[0].author.username
+    assert first["category"] == posts[0].category.slug
+
+
+def test_export_filters(staff_client, posts, user):
+    response = staff_client.get("/export/", {"author": user.username})
+    assert {item["author"] for item in _lines(response)} == {user.username}
+
+    day = timezone.localdate(posts[2].pub_date)
+    response = staff_client.get(
+        "/export/", {"since": day.isoformat(), "until": day.isoformat()})
+    assert [item["id"] for item in _lines(response)] == [posts[2].id]
+
+    assert staff_client.get(
+        "/export/", {"since": "вчера"}).status_code == 400
+
+
+def test_export_query_count_does_not_depend_on_size(
+        staff_client, mixer: Mixer, user, published_category):
+    counts = []
+    for _ in range(2):
+        post = mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            location=None,
+        )
+        mixer.cycle(5).blend("blog.Comment", post=post, author=user)
+        with CaptureQueriesContext(connection) as ctx:
+            _lines(staff_client.get("/export/"))
+        counts.append(len(ctx.captured_queries))
+    assert counts[0] == counts[1], (
+        "Убедитесь, что комментарии выгружаются одним запросом на пачку"
+        " постов, а не запросом на каждый пост."
+    )
+
+
+def test_export_blog_command(tmp_path, posts, published_category):
+    out = StringIO()
+    call_command(
+        "export_blog", "--category", published_category.slug,
+        "--chunk-size", "2", stdout=out,
+    )
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [item["id"] for item in lines] == sorted(post.id for post in posts)
+
+    output = tmp_path / "blog.ndjson"
+    call_command(
+        "export_blog", "--output", str(output), "--category", "no-such",
+        stderr=StringIO(),
+    )
+    assert output.read_text(encoding="utf-8") == ""
@@ -0,0 +1,114 @@
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_posts(mixer: Mixer, user, another_user, published_category):
+    now = timezone.now()
+    visible = mixer.blend(
+        "blog.Post", title="Видимый пост", author=user,
+        category=published_category, location=None, is_published=True,
+        pub_date=now - timezone.timedelta(hours=1),
+    )
+    mixer.blend(
+        "blog.Post", title="Чужой пост", author=another_user,
+        category=published_category, location=None, is_published=True,
+        pub_date=now - timezone.timedelta(hours=2),
+    )
+    mixer.blend(
+        "blog.Post", title="Черновик", author=user,
+        category=published_category, location=None, is_published=False,
+        pub_date=now - timezone.timedelta(hours=1),
+    )
+    mixer.blend(
+        "blog.Post", title="Отложенный пост", author=user,
+        category=published_category, location=None, is_published=True,
+        pub_date=now + timezone.timedelta(hours=1),
+    )
+    return visible
+
+
+def test_feeds_show_published_posts(
+        client, feed_posts, user, published_category):
+    urls = (
+        "/feeds/rss/", "/feeds/atom/",
+        f"/category/{published_category.slug}/rss/",
+        f"/category/{published_category.slug}/atom/",
+        f"/profile/{user.username}/rss/",
+        f"/profile/{user.username}/atom/",
+    )
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == 200, url
+        content = response.content.decode()
+        assert "Видимый пост" in content
+        hidden = ("Черновик", "Отложенный пост")
+        assert not any(title in content for title in hidden), (
+            f"Убедитесь, что лента `{url}` содержит только опубликованные"
+            " посты."
+        )
+        kind = "atom" if url.endswith("atom/") else "rss"
+        assert response["Content-Type"].startswith(f"application/{kind}+xml")
+    author_feed = client.get(f"/profile/{user.username}/rss/").content
+    assert "Чужой пост" not in author_feed.decode()
+
+
+def test_unpublished_category_feed_is_404(client, mixer: Mixer):
+    category = mixer.blend("blog.Category", is_published=False)
+    assert client.get(f"/category/{category.slug}/rss/").status_code == 404
+
+
+def test_feed_is_cached_until_publication(client, feed_posts, mixer: Mixer):
+    first = client.get("/feeds/rss/")
+    with CaptureQueriesContext(connection) as ctx:
+        again = client.get("/feeds/rss/")
+        not_modified = client.get(
+            "/feeds/rss/", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert again.content == first.content
+    assert not_modified.status_code == 304
+    assert not first.has_header("Last-Modified"), (
+        "Убедитесь, что ленты сверяются только по ETag: удаление поста"
+        " не сдвигает дату самого нового поста."
+    )
+    assert not ctx.captured_queries, (
+        "Убедитесь, что повторный и условный запросы ленты обслуживаются"
+        " из кеша без обращения к базе данных."
+    )
+
+    mixer.blend("blog.Comment", post=feed_posts, author=feed_posts.author)
+    assert client.get(
+        "/feeds/rss/", HTTP_IF_NONE_MATCH=first["ETag"]
+    ).status_code == 304
+
+    feed_posts.title = "Исправленный пост"
+    feed_posts.save()
+    response = client.get("/feeds/rss/", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert response.status_code == 200, (
+        "Убедитесь, что изменение поста сбрасывает кеш лент."
+    )
+    assert "Исправленный пост" in response.content.decode()
+
+
+def test_feed_cache_expires(client, settings, monkeypatch, feed_posts):
+    settings.FEED_CACHE_TIMEOUT = 60
+    client.get("/feeds/rss/")
+    # Запись из другого процесса: сигналы этого процесса не приходят.
+    type(feed_posts).objects.filter(pk=feed_posts.pk).update(
+        title="Пост из другого процесса")
+    assert "Пост из другого процесса" not in (
+        client.get("/feeds/rss/").content.decode())
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert "Пост из другого процесса" in (
+        client.get("/feeds/rss/").content.decode()
+    ), (
+        "Убедитесь, что XML ленты хранится в кеше ограниченное время"
+        " (settings.FEED_CACHE_TIMEOUT)."
+    )
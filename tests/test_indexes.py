@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="План запроса SQLite"
+    ),
+]
+
+
+def _assert_uses_index(queryset, index_name):
+    plan = queryset.explain()
+    assert f"USING INDEX {index_name}" in plan, (
+        f"Убедитесь, что запрос использует индекс `{index_name}`:\n{plan}"
+    )
+    # Обход частичного индекса по порядку допустим: LIMIT его обрывает.
+    full_scans = [
+        line for line in plan.splitlines()
+        if ("SCAN blog_post" in line or "SCAN blog_comment" in line)
+        and "USING INDEX" not in line
+    ]
+    assert not full_scans, (
+        f"Убедитесь, что запрос не читает таблицу целиком:\n{plan}"
+    )
+    assert "TEMP B-TREE" not in plan, (
+        f"Убедитесь, что сортировка берётся из индекса:\n{plan}"
+    )
+
+
+def test_index_feed_uses_index(PostModel):
+    _assert_uses_index(
+        PostModel.objects.published().with_feed_relations()[:10],
+        "post_published_pub_date_idx",
+    )
+
+
+def test_category_feed_uses_index(PostModel, published_category):
+    _assert_uses_index(
+        published_category.posts.published().with_feed_relations()[:10],
+        "post_category_pub_date_idx",
+    )
+
+
+def test_profile_feed_uses_index(PostModel, user):
+    _assert_uses_index(
+        user.posts.with_feed_relations()[:10], "post_author_pub_date_idx"
+    )
+    _assert_uses_index(
+        user.posts.published().with_feed_relations()[:10],
+        "post_author_pub_date_idx",
+    )
+
+
+def test_post_comments_use_index(post_with_published_location):
+    _assert_uses_index(
+        post_with_published_location.comments.select_related("author"),
+        "comment_post_created_at_idx",
+    )
+
+
+def test_scheduled_posts_use_index(PostModel):
+    _assert_uses_index(
+        PostModel.objects.due_for_publication(),
+        "post_scheduled_pub_date_idx",
+    )
@@ -0,0 +1,116 @@
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from PIL import Image
+
+from blog import tasks as blog_tasks
+from blog.thumbnails import thumbnail_name
+from core import tasks
+from core.models import Job
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _jpeg_with_exif():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: повернуть на 90°
+    exif[0x010F] = "Camera"
+    buffer = BytesIO()
+    Image.new("RGB", (200, 100), color=(1, 2, 3)).save(
+        buffer, "JPEG", exif=exif)
+    return SimpleUploadedFile(
+        "photo.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+
+@pytest.fixture
+def created_post(user_client, published_category, published_location,
+                 PostModel):
+    response = user_client.post("/posts/create/", {
+        "title": "Фото",
+        "text": "Текст",
+        "pub_date": "2020-01-01T10:00",
+        "category": published_category.id,
+        "location": published_location.id,
+        "image": _jpeg_with_exif(),
+    })
+    assert response.status_code == 302
+    return PostModel.objects.get(title="Фото")
+
+
+def test_image_is_processed_in_background(created_post):
+    post = created_post
+    assert post.image_processing, (
+        "Убедитесь, что до завершения фоновой обработки публикация помечена"
+        " как обрабатываемая."
+    )
+    job = Job.objects.get()
+    assert job.status == Job.PENDING
+    assert not post.image.storage.exists(
+        thumbnail_name(post.image.name, "card"))
+
+    call_command("run_jobs", stdout=StringIO())
+
+    job.refresh_from_db()
+    post.refresh_from_db()
+    assert job.status == Job.DONE
+    assert not post.image_processing
+    assert post.image.storage.exists(thumbnail_name(post.image.name, "card"))
+    with post.image.open("rb") as source:
+        image = Image.open(source)
+        assert image.size == (100, 200), (
+            "Убедитесь, что изображение поворачивается по EXIF."
+        )
+        assert not image.getexif(), (
+            "Убедитесь, что метаданные EXIF удаляются из изображения."
+        )
+
+
+@override_settings(JOBS_MAX_ATTEMPTS=2)
+def test_failed_job_is_retried_then_marked_failed(monkeypatch):
+    calls = []
+
+    def broken(**payload):
+        calls.append(payload)
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(tasks._handlers, "test.broken", broken)
+    job = tasks.enqueue("test.broken", value=1)
+
+    assert tasks.run_pending() == 0
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (Job.PENDING, 1)
+    assert "boom" in job.last_error
+
+    tasks.run_pending()
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (Job.FAILED, 2)
+    assert calls == [{"value": 1}, {"value": 1}]
+
+
+@override_settings(JOBS_EAGER=True)
+def test_eager_jobs_run_immediately(monkeypatch):
+    calls = []
+    monkeypatch.setitem(
+        tasks._handlers, "test.ok", lambda **payload: calls.append(payload))
+    job = tasks.enqueue("test.ok", value=2)
+    job.refresh_from_db()
+    assert job.status == Job.DONE
+    assert calls == [{"value": 2}]
+
+
+def test_failed_image_job_clears_processing_flag(monkeypatch, created_post):
+    def broken(image):
+        raise RuntimeError("storage")
+
+    monkeypatch.setattr(blog_tasks, "generate_thumbnails", broken)
+    call_command("run_jobs", stdout=StringIO())
+    created_post.refresh_from_db()
+    assert Job.objects.get().status == Job.PENDING
+    assert not created_post.image_processing, (
+        "Убедитесь, что после сбоя обработки пост не остаётся навсегда"
+        " в состоянии «Изображение обрабатывается…»."
+    )
+    assert created_post.image.storage.exists(created_post.image.name)
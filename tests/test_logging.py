@@ -0,0 +1,48 @@
+import logging
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def commented_post(mixer: Mixer, post_with_published_location):
+    mixer.cycle(3).blend("blog.Comment", post=post_with_published_location)
+    return post_with_published_location
+
+
+def _get_detail(client, post):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(f"/posts/{post.id}/")
+    return ctx.captured_queries
+
+
+def test_debug_logging_of_post_detail(caplog, user_client, commented_post):
+    caplog.set_level(logging.DEBUG, logger="blog")
+    _get_detail(user_client, commented_post)
+    messages = [
+        r.getMessage() for r in caplog.records
+        if r.name.startswith("blog.views")
+    ]
+    assert any(
+        f"post_id={commented_post.id}" in message for message in messages
+    ), "Убедитесь, что отладочный вывод post_detail идёт через logging."
+
+
+def test_disabled_debug_logging_costs_nothing(
+        caplog, user_client, commented_post):
+    caplog.set_level(logging.DEBUG, logger="blog")
+    with_debug = _get_detail(user_client, commented_post)
+    caplog.set_level(logging.INFO, logger="blog")
+    caplog.clear()
+    without_debug = _get_detail(user_client, commented_post)
+    assert not [
+        r for r in caplog.records if r.name.startswith("blog.views")
+    ]
+    assert len(without_debug) == len(with_debug), (
+        "Убедитесь, что отладочный вывод post_detail не выполняет"
+        " дополнительных запросов к базе данных."
+    )
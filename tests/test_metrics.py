@@ -0,0 +1,67 @@
+import re
+
+import pytest
+from mixer.backend.django import Mixer
+
+from core import metrics
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def enable_metrics(settings):
+    settings.METRICS_ENABLED = True
+    settings.PAGE_CACHE_ENABLED = False
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_server_timing_header(client, post_with_published_location):
+    response = client.get(f"/posts/{post_with_published_location.id}/")
+    timing = response.headers.get("Server-Timing", "")
+    match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', timing)
+    assert match and int(match.group(1)) > 0, (
+        "Убедитесь, что ответ содержит заголовок Server-Timing"
+        " с числом SQL-запросов."
+    )
+    assert re.search(r"tpl;dur=[\d.]+", timing)
+    assert re.search(r"total;dur=[\d.]+", timing)
+
+
+def test_metrics_endpoint_is_staff_only(
+        client, user_client, mixer: Mixer, post_with_published_location):
+    for _ in range(3):
+        client.get("/")
+    client.get(f"/posts/{post_with_published_location.id}/")
+
+    assert client.get("/metrics/").status_code == 302
+    assert user_client.get("/metrics/").status_code == 302
+
+    staff = mixer.blend("auth.User", is_staff=True)
+    client.force_login(staff)
+    data = client.get("/metrics/").json()
+    assert data["blog:index"]["count"] == 3
+    index = data["blog:index"]
+    assert set(index["queries"]) == {"p50", "p95", "p99"}
+    assert index["size"]["p50"] > 0
+    assert index["template_ms"]["p99"] >= index["template_ms"]["p50"] > 0, (
+        "Убедитесь, что метрики учитывают время рендеринга шаблонов."
+    )
+    assert "blog:post_detail" in data
+
+
+def test_ring_buffer_keeps_last_requests(settings):
+    settings.METRICS_BUFFER_SIZE = 5
+    for queries in range(10):
+        sample = metrics.Sample()
+        sample.queries = queries
+        metrics.record("view", sample)
+    stats = metrics.summary()["view"]
+    assert stats["count"] == 5
+    assert stats["queries"] == {"p50": 7, "p95": 9, "p99": 9}
+
+
+def test_disabled_metrics_add_no_header(client, settings):
+    settings.METRICS_ENABLED = False
+    assert not client.get("/").has_header("Server-Timing")
@@ -0,0 +1,109 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import override_settings
+from django.utils import timezone
+
+from core.mail import queue_mail, send_queued_mail
+from core.models import OutgoingEmail
+
+pytestmark = [pytest.mark.django_db]
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+
+class FailingBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError("SMTP недоступен")
+
+
+def test_registration_queues_welcome_mail(client):
+    response = client.post("/auth/registration/", {
+        "username": "newcomer",
+        "email": "newcomer@example.com",
+        "password1": "Sup3r-secret-pass",
+        "password2": "Sup3r-secret-pass",
+    })
+    assert response.status_code == 302
+    assert mail.outbox == [], (
+        "Убедитесь, что письмо при регистрации не отправляется в запросе,"
+        " а ставится в очередь."
+    )
+    email = OutgoingEmail.objects.get()
+    assert email.recipients == ["newcomer@example.com"]
+    assert email.status == OutgoingEmail.PENDING
+
+
+@override_settings(
+    EMAIL_BACKEND="test_outbox.CountingBackend", EMAIL_OUTBOX_BATCH_SIZE=3)
+def test_outbox_is_drained_in_batches_over_one_connection():
+    CountingBackend.opened = 0
+    for i in range(5):
+        OutgoingEmail.objects.create(
+            subject=f"Письмо {i}", body="Текст", from_email="from@example.com",
+            recipients=[f"user{i}@example.com"],
+        )
+    assert send_queued_mail() == 5
+    assert len(mail.outbox) == 5
+    assert CountingBackend.opened == 2
+    assert not OutgoingEmail.objects.exclude(status=OutgoingEmail.SENT)
+
+
+@override_settings(
+    EMAIL_BACKEND="test_outbox.FailingBackend",
+    EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_RETRY_DELAY=60)
+def test_failed_mail_is_retried_with_backoff():
+    email = OutgoingEmail.objects.create(
+        subject="Тема", body="Текст", from_email="from@example.com",
+        recipients=["user@example.com"],
+    )
+    before = timezone.now()
+    assert send_queued_mail() == 0
+    email.refresh_from_db()
+    assert email.status == OutgoingEmail.PENDING
+    assert email.attempts == 1
+    assert email.next_attempt_at >= before + timedelta(seconds=60)
+    assert "SMTP" in email.last_error
+
+    assert send_queued_mail() == 0, "Повтор не должен начаться раньше срока."
+    OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+    send_queued_mail()
+    email.refresh_from_db()
+    assert email.status == OutgoingEmail.FAILED
+    assert email.attempts == 2
+
+
+@override_settings(JOBS_EAGER=True)
+def test_queue_mail_triggers_background_delivery():
+    queue_mail("Тема", "Текст", "from@example.com", ["user@example.com"])
+    assert len(mail.outbox) == 1
+    assert OutgoingEmail.objects.get().status == OutgoingEmail.SENT
+
+
+@override_settings(EMAIL_OUTBOX_SENDING_TIMEOUT=600)
+def test_stale_sending_mail_is_requeued():
+    now = timezone.now()
+    stale, fresh = (
+        OutgoingEmail.objects.create(
+            subject="Тема", body="Текст", from_email="from@example.com",
+            recipients=["user@example.com"], status=OutgoingEmail.SENDING,
+            claimed_at=claimed_at,
+        )
+        for claimed_at in (now - timedelta(minutes=30), now)
+    )
+    assert send_queued_mail() == 1, (
+        "Убедитесь, что письмо, зависшее в статусе «Отправляется» дольше"
+        " EMAIL_OUTBOX_SENDING_TIMEOUT, возвращается в очередь."
+    )
+    stale.refresh_from_db()
+    fresh.refresh_from_db()
+    assert stale.status == OutgoingEmail.SENT
+    assert fresh.status == OutgoingEmail.SENDING
@@ -0,0 +1,120 @@
+import re
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.middleware.csrf import _does_token_match
+from django.template import RequestContext, Template
+from django.urls import resolve
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from core.page_cache import AnonymousPageCacheMiddleware
+
+pytestmark = [pytest.mark.django_db]
+
+PUBLIC_URLS = ("/", "/pages/about/", "/pages/rules/")
+
+
+@pytest.fixture(autouse=True)
+def enable_page_cache(settings):
+    settings.PAGE_CACHE_ENABLED = True
+
+
+def _get_twice(client, url):
+    first = client.get(url)
+    with CaptureQueriesContext(connection) as ctx:
+        second = client.get(url)
+    return first, second, ctx.captured_queries
+
+
+def test_anonymous_pages_are_cached(client, post_with_published_location):
+    post = post_with_published_location
+    urls = PUBLIC_URLS + (
+        f"/category/{post.category.slug}/", f"/posts/{post.id}/")
+    for url in urls:
+        first, second, queries = _get_twice(client, url)
+        assert first.status_code == second.status_code == 200
+        assert first["X-Page-Cache"] == "miss"
+        assert second["X-Page-Cache"] == "hit", (
+            f"Убедитесь, что страница `{url}` кешируется для анонимов."
+        )
+        assert second.content == first.content
+        assert not queries, (
+            "Убедитесь, что страница из кеша не обращается к базе данных."
+        )
+
+
+def test_cache_key_includes_pagination(client, post_with_published_location):
+    client.get("/")
+    response = client.get("/", {"page": 2})
+    assert response["X-Page-Cache"] == "miss"
+    response = client.get("/", {"utm_source": "feed"})
+    assert response["X-Page-Cache"] == "hit", (
+        "Убедитесь, что в ключ кеша входят только параметры пагинации."
+    )
+
+
+def test_logged_in_users_bypass_cache(
+        client, user_client, post_with_published_location):
+    client.get("/")
+    response = user_client.get("/")
+    assert not response.has_header("X-Page-Cache"), (
+        "Убедитесь, что вошедшие пользователи не получают страницы из кеша."
+    )
+
+
+def test_writes_invalidate_cached_pages(
+        mixer: Mixer, client, user, post_with_published_location):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    client.get(url)
+    client.get("/")
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    response = client.get(url)
+    assert response["X-Page-Cache"] == "miss", (
+        "Убедитесь, что новый комментарий сбрасывает кеш страниц."
+    )
+    assert comment.text.split()[0] in response.content.decode()
+
+    post.category.title = "Новое название категории"
+    post.category.save()
+    response = client.get("/")
+    assert "Новое название категории" in response.content.decode()
+
+
+def _render_csrf_form(request):
+    return HttpResponse(
+        Template("<form>{% csrf_token %}</form>").render(
+            RequestContext(request))
+    )
+
+
+def _serve_through_middleware(rf):
+    request = rf.get("/")
+    request.user = AnonymousUser()
+    request.resolver_match = resolve("/")
+    middleware = AnonymousPageCacheMiddleware(_render_csrf_form)
+    response = middleware.process_view(request, _render_csrf_form, (), {})
+    if response is None:
+        response = _render_csrf_form(request)
+    return request, middleware.process_response(request, response)
+
+
+def _csrf_token(response):
+    return re.search(
+        r'name="csrfmiddlewaretoken" value="([^"]+)"',
+        response.content.decode(),
+    ).group(1)
+
+
+def test_cached_page_gets_fresh_csrf_token(rf):
+    _, first = _serve_through_middleware(rf)
+    request, second = _serve_through_middleware(rf)
+    assert first["X-Page-Cache"] == "miss"
+    assert second["X-Page-Cache"] == "hit"
+    assert b"__page_cache_csrf_token__" not in second.content
+    assert _does_token_match(
+        _csrf_token(second), request.META["CSRF_COOKIE"]
+    ), "Убедитесь, что в страницу из кеша подставляется свежий токен CSRF."
@@ -0,0 +1,76 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _card_key(post):
+    from blog.signals import post_card_cache_key
+
+    post.refresh_from_db()
+    return post_card_cache_key(post)
+
+
+def test_post_card_is_cached(client, post_with_published_location):
+    post = post_with_published_location
+    client.get("/")
+    assert cache.get(_card_key(post)) is not None, (
+        "Убедитесь, что карточка публикации кешируется при выводе ленты."
+    )
+
+
+def test_post_card_invalidation(
+        mixer: Mixer, client, post_with_published_location):
+    post = post_with_published_location
+    client.get("/")
+
+    mixer.blend("blog.Comment", post=post)
+    assert cache.get(_card_key(post)) is None
+    assert "Комментарии (1)" in client.get("/").content.decode()
+
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" in client.get("/").content.decode()
+
+    post.category.title = "Новая категория"
+    post.category.save()
+    assert "Новая категория" in client.get("/").content.decode()
+
+    post.location.name = "Новое место"
+    post.location.save()
+    assert "Новое место" in client.get("/").content.decode()
+
+    post.author.username = "new_username"
+    post.author.save()
+    assert "@new_username" in client.get("/").content.decode()
+
+    key = _card_key(post)
+    post.delete()
+    assert cache.get(key) is None
+
+
+def test_cached_cards_render_without_extra_queries(
+        client, post_with_published_location):
+    client.get("/")
+    with CaptureQueriesContext(connection) as ctx:
+        content = client.get("/").content.decode()
+    assert post_with_published_location.title in content
+    assert len(ctx.captured_queries) <= 2
+
+
+def test_loaddata_db_json(monkeypatch, PostModel):
+    # Фикстура сохраняется в обход pre_save полей: updated_at берётся
+    # из значения по умолчанию.
+    monkeypatch.chdir(Path(__file__).resolve().parent.parent)
+    call_command("loaddata", "db.json", stdout=StringIO())
+    assert PostModel.objects.count() == 39
+    assert not PostModel.objects.filter(updated_at__isnull=True).exists(), (
+        "Убедитесь, что фикстура db.json загружается через loaddata."
+    )
@@ -0,0 +1,102 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    return len(ctx.captured_queries)
+
+
+def _feed_urls(user, category):
+    return (
+        "/",
+        f"/category/{category.slug}/",
+        f"/profile/{user.username}/",
+    )
+
+
+def test_feed_queries_do_not_depend_on_posts_count(
+        mixer: Mixer, user, user_client, another_user_client,
+        published_category, published_location):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location,
+    )
+    single = {
+        url: (
+            _count_queries(user_client, url),
+            _count_queries(another_user_client, url),
+        )
+        for url in _feed_urls(user, published_category)
+    }
+    locations = mixer.cycle(N_PER_PAGE).blend(
+        "blog.Location", is_published=True)
+    mixer.cycle(N_PER_PAGE).blend(
+        "blog.Post", author=user, category=published_category,
+        location=mixer.sequence(*locations),
+    )
+    for url, expected in single.items():
+        counted = (
+            _count_queries(user_client, url),
+            _count_queries(another_user_client, url),
+        )
+        assert counted == expected, (
+            f"Убедитесь, что количество SQL-запросов на странице `{url}`"
+            " не зависит от количества публикаций на ней."
+        )
+
+
+def test_post_detail_loads_comments_in_one_query(
+        mixer: Mixer, user_client, post_with_published_location):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    mixer.blend("blog.Comment", post=post)
+    expected = _count_queries(user_client, url)
+    mixer.cycle(N_PER_PAGE).blend("blog.Comment", post=post)
+    assert _count_queries(user_client, url) == expected, (
+        "Убедитесь, что комментарии на странице публикации загружаются"
+        " одним запросом вместе с авторами."
+    )
+
+
+@override_settings(COMMENTS_PER_PAGE=2)
+def test_post_detail_paginates_comments(
+        mixer: Mixer, user_client, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(5).blend("blog.Comment", post=post)
+    response = user_client.get(f"/posts/{post.id}/")
+    assert [c.id for c in response.context["comments"]] == [
+        c.id for c in comments[:2]
+    ]
+    response = user_client.get(f"/posts/{post.id}/?comments_page=3")
+    assert [c.id for c in response.context["comments"]] == [comments[4].id]
+
+
+def test_page_links_are_elided(
+        mixer: Mixer, client, settings, user, published_category):
+    settings.POSTS_PER_PAGE = 1
+    mixer.cycle(30).blend(
+        "blog.Post", author=user, category=published_category,
+        location=None, is_published=True,
+    )
+    content = client.get("/", {"page": 15}).content.decode()
+    numbers = set(re.findall(r'page=(\d+)"', content))
+    assert "…" in content
+    assert len(numbers) <= 12, (
+        "Убедитесь, что пагинатор выводит номера страниц вокруг текущей,"
+        " а не все страницы."
+    )
+    assert {"1", "14", "16", "30"} <= numbers
@@ -0,0 +1,145 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.urls import urlpatterns as blog_urlpatterns
+from pages.urls import urlpatterns as pages_urlpatterns
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = 200
+N_COMMENTS = 300
+N_POST_COMMENTS = 60
+
+# Максимум SQL-запросов на GET-запрос: (аноним, автор).
+# Аноним без сессии не обращается к таблицам сессий и пользователей.
+QUERY_BUDGETS = {
+    "blog:index": (2, 4),
+    "blog:category_posts": (4, 5),
+    "blog:profile": (3, 5),
+    "blog:feed_rss": (1, 0),
+    "blog:feed_atom": (1, 0),
+    "blog:category_feed_rss": (2, 0),
+    "blog:category_feed_atom": (2, 0),
+    "blog:profile_feed_rss": (2, 0),
+    "blog:profile_feed_atom": (2, 0),
+    "blog:search": (3, 5),
+    "blog:export": (0, 2),
+    "blog:edit_profile": (0, 2),
+    "blog:password_change": (0, 2),
+    "blog:create_post": (0, 4),
+    "blog:post_detail": (4, 5),
+    "blog:edit_post": (0, 6),
+    "blog:delete_post": (0, 4),
+    "blog:add_comment": (0, 3),
+    "blog:edit_comment": (0, 4),
+    "blog:delete_comment": (0, 4),
+    "pages:about": (0, 2),
+    "pages:rules": (0, 2),
+}
+
+
+@pytest.fixture(autouse=True)
+def disable_caches(settings):
+    # Бюджет считается для настоящего рендеринга, а не для кеша страниц.
+    settings.PAGE_CACHE_ENABLED = False
+
+
+@pytest.fixture
+def dataset(mixer: Mixer, user, another_user, published_location):
+    categories = mixer.cycle(3).blend("blog.Category", is_published=True)
+    authors = (user, another_user)
+    now = timezone.now()
+    posts = mixer.cycle(N_POSTS).blend(
+        "blog.Post",
+        author=(authors[i % 2] for i in range(N_POSTS)),
+        category=(categories[i % 3] for i in range(N_POSTS)),
+        location=(published_location if i % 2 else None
+                  for i in range(N_POSTS)),
+        is_published=True,
+        pub_date=(now - timezone.timedelta(hours=i) for i in range(N_POSTS)),
+    )
+    post = posts[0]
+    mixer.cycle(N_POST_COMMENTS).blend(
+        "blog.Comment", post=post,
+        author=(authors[i % 2] for i in range(N_POST_COMMENTS)),
+    )
+    mixer.cycle(N_COMMENTS - N_POST_COMMENTS).blend(
+        "blog.Comment",
+        post=(posts[i % N_POSTS] for i in range(1, N_COMMENTS)),
+        author=(authors[i % 2] for i in range(N_COMMENTS)),
+    )
+    comment = post.comments.filter(author=user).first()
+    return {
+        "blog:category_posts": {"category_slug": categories[0].slug},
+        "blog:profile": {"username": user.username},
+        "blog:category_feed_rss": {"category_slug": categories[0].slug},
+        "blog:category_feed_atom": {"category_slug": categories[0].slug},
+        "blog:profile_feed_rss": {"username": user.username},
+        "blog:profile_feed_atom": {"username": user.username},
+        "blog:post_detail": {"post_id": post.id},
+        "blog:edit_post": {"post_id": post.id},
+        "blog:delete_post": {"post_id": post.id},
+        "blog:add_comment": {"post_id": post.id},
+        "blog:edit_comment": {"post_id": post.id, "comment_id": comment.id},
+        "blog:delete_comment": {"post_id": post.id, "comment_id": comment.id},
+    }
+
+
+def _route_names():
+    names = {f"blog:{pattern.name}" for pattern in blog_urlpatterns}
+    return names | {f"pages:{pattern.name}" for pattern in pages_urlpatterns}
+
+
+def _url(name, dataset):
+    url = reverse(name, kwargs=dataset.get(name, {}))
+    return url + "?q=test" if name == "blog:search" else url
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(url)
+    return len(ctx.captured_queries)
+
+
+def test_every_route_has_a_budget():
+    assert _route_names() == set(QUERY_BUDGETS), (
+        "Добавьте бюджет запросов для новых маршрутов blog.urls и pages.urls."
+    )
+
+
+def test_routes_stay_within_query_budget(client, user_client, dataset):
+    over_budget = []
+    for name, budgets in QUERY_BUDGETS.items():
+        url = _url(name, dataset)
+        for who, a_client, budget in zip(
+                ("аноним", "автор"), (client, user_client), budgets):
+            count = _count_queries(a_client, url)
+            if count > budget:
+                over_budget.append(f"{url} ({who}): {count} > {budget}")
+    assert not over_budget, (
+        "Превышен бюджет SQL-запросов:\n" + "\n".join(over_budget)
+    )
+
+
+@pytest.mark.parametrize(
+    "name", ["blog:index", "blog:category_posts", "blog:profile",
+             "blog:post_detail"]
+)
+def test_query_count_does_not_depend_on_page_size(
+        settings, user_client, dataset, name):
+    url = _url(name, dataset)
+    counts = []
+    for per_page in (5, 50):
+        settings.POSTS_PER_PAGE = per_page
+        settings.COMMENTS_PER_PAGE = per_page
+        # Первый запрос заполняет кеш списка постов категории.
+        user_client.get(url)
+        counts.append(_count_queries(user_client, url))
+    assert counts[0] == counts[1], (
+        f"Убедитесь, что число запросов страницы `{url}` не зависит"
+        " от размера страницы."
+    )
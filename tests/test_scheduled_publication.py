@@ -0,0 +1,132 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.models import PostQuerySet
+from blog.publishing import publish_due_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def scheduled_post(mixer: Mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, location=None,
+        pub_date=timezone.now() + timezone.timedelta(hours=1),
+    )
+
+
+def test_visibility_follows_post_state(PostModel, scheduled_post):
+    assert scheduled_post.visibility == PostModel.SCHEDULED
+    scheduled_post.pub_date = timezone.now() - timezone.timedelta(hours=1)
+    scheduled_post.save()
+    assert scheduled_post.visibility == PostModel.VISIBLE
+    scheduled_post.is_published = False
+    scheduled_post.save(update_fields=["is_published"])
+    scheduled_post.refresh_from_db()
+    assert scheduled_post.visibility == PostModel.HIDDEN, (
+        "Убедитесь, что снятый с публикации пост скрывается,"
+        " даже если сохранены не все поля."
+    )
+
+
+def test_publish_scheduled_shows_post_and_resets_caches(
+        client, monkeypatch, PostModel, scheduled_post):
+    url = f"/posts/{scheduled_post.id}/"
+    index = client.get("/")
+    assert scheduled_post.title not in index.content.decode()
+    assert client.get(url).status_code == 404
+
+    later = scheduled_post.pub_date + timezone.timedelta(minutes=1)
+    monkeypatch.setattr(timezone, "now", lambda: later)
+    out = StringIO()
+    call_command("publish_scheduled", stdout=out)
+    assert "1" in out.getvalue()
+
+    scheduled_post.refresh_from_db()
+    assert scheduled_post.visibility == PostModel.VISIBLE
+    response = client.get("/", HTTP_IF_NONE_MATCH=index.headers["ETag"])
+    assert response.status_code == 200, (
+        "Убедитесь, что публикация отложенного поста сбрасывает кеш"
+        " и меняет ETag ленты."
+    )
+    assert scheduled_post.title in response.content.decode()
+    assert client.get(url).status_code == 200
+
+    call_command("publish_scheduled", stdout=out)
+    assert PostModel.objects.due_for_publication().count() == 0
+
+
+def test_resync_fixes_loaded_posts(
+        PostModel, scheduled_post, post_with_published_location):
+    post = post_with_published_location
+    PostModel.objects.update(visibility=PostModel.HIDDEN)
+    call_command("publish_scheduled", "--resync", stdout=StringIO())
+    scheduled_post.refresh_from_db()
+    post.refresh_from_db()
+    assert scheduled_post.visibility == PostModel.SCHEDULED
+    assert post.visibility == PostModel.VISIBLE, (
+        "Убедитесь, что `publish_scheduled --resync` восстанавливает"
+        " видимость постов, загруженных в обход save()."
+    )
+
+
+def test_publish_skips_post_hidden_meanwhile(
+        monkeypatch, PostModel, scheduled_post):
+    select_due = PostQuerySet.due_for_publication
+
+    def hide_after_select(queryset, now=None):
+        due = list(select_due(queryset, now).values_list("pk", flat=True))
+        PostModel.objects.filter(pk=scheduled_post.pk).update(
+            is_published=False, visibility=PostModel.HIDDEN)
+        return PostModel.objects.filter(pk__in=due)
+
+    monkeypatch.setattr(PostQuerySet, "due_for_publication", hide_after_select)
+    later = scheduled_post.pub_date + timezone.timedelta(minutes=1)
+    assert publish_due_posts(later) == 0
+    scheduled_post.refresh_from_db()
+    assert scheduled_post.visibility == PostModel.HIDDEN, (
+        "Убедитесь, что publish_scheduled не публикует пост, снятый"
+        " с публикации между выборкой и записью."
+    )
+
+
+def test_loaddata_sets_visibility_and_comment_count(
+        tmp_path, PostModel, user, published_category):
+    timestamp = "2020-01-01T00:00:00Z"
+    future = (timezone.now() + timezone.timedelta(days=1)).isoformat()
+    posts = [
+        {"model": "blog.post", "pk": pk, "fields": {
+            "title": "Пост", "text": "Текст", "pub_date": pub_date,
+            "is_published": is_published, "created_at": timestamp,
+            "author": user.pk, "category": published_category.pk,
+            "image": "",
+        }}
+        for pk, pub_date, is_published in (
+            (1, timestamp, True), (2, future, True), (3, timestamp, False))
+    ]
+    comments = [
+        {"model": "blog.comment", "pk": pk, "fields": {
+            "text": "Комментарий", "post": 1, "author": user.pk,
+            "created_at": timestamp,
+        }}
+        for pk in (1, 2)
+    ]
+    fixture = tmp_path / "posts.json"
+    fixture.write_text(json.dumps(posts + comments), encoding="utf-8")
+    call_command("loaddata", str(fixture), stdout=StringIO())
+    visibility = dict(PostModel.objects.values_list("pk", "visibility"))
+    assert visibility == {
+        1: PostModel.VISIBLE, 2: PostModel.SCHEDULED, 3: PostModel.HIDDEN,
+    }, (
+        "Убедитесь, что посты, загруженные через loaddata, сразу получают"
+        " видимость по is_published и pub_date."
+    )
+    assert PostModel.objects.get(pk=1).comment_count == 2, (
+        "Убедитесь, что loaddata комментариев обновляет счётчик поста."
+    )
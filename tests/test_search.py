@@ -0,0 +1,87 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+BACKENDS = [
+    pytest.param(
+        "fts5", marks=pytest.mark.skipif(
+            connection.vendor != "sqlite", reason="FTS5 есть только в SQLite"
+        )
+    ),
+    "terms",
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def search_backend(request):
+    with override_settings(SEARCH_BACKEND=request.param):
+        yield request.param
+
+
+@pytest.fixture
+def searchable_posts(
+        search_backend, mixer: Mixer, user, published_category):
+    def blend(title, text, **kwargs):
+        return mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            location=None, title=title, text=text, **kwargs
+        )
+
+    return {
+        "title": blend("Путешествие на Байкал", "Заметки о поездке"),
+        "text": blend("Заметки", "Лёд Байкала и путешествие по нему"),
+        "other": blend("Рецепт пирога", "Мука, яйца, сахар"),
+        "hidden": blend(
+            "Байкал зимой", "Путешествие по льду", is_published=False),
+    }
+
+
+def _found(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200, (
+        "Убедитесь, что страница поиска `/search/` загружается без ошибок."
+    )
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_search_ranks_title_matches_first(client, searchable_posts):
+    assert _found(client, "Путешествие") == [
+        searchable_posts["title"].id, searchable_posts["text"].id
+    ], (
+        "Убедитесь, что поиск находит только опубликованные посты и ставит"
+        " совпадения в заголовке выше совпадений в тексте."
+    )
+    assert _found(client, "ПИРОГА") == [searchable_posts["other"].id]
+    assert _found(client, "несуществующее") == []
+    assert _found(client, "") == []
+
+
+def test_search_index_follows_posts(client, searchable_posts):
+    post = searchable_posts["other"]
+    post.title = "Рецепт торта"
+    post.save()
+    assert _found(client, "пирога") == []
+    assert _found(client, "торта") == [post.id]
+    post.delete()
+    assert _found(client, "торта") == []
+
+
+def test_rebuild_search_index(client, searchable_posts, search_backend):
+    call_command("rebuild_search_index", stdout=StringIO())
+    assert _found(client, "пирога") == [searchable_posts["other"].id]
+
+
+def test_search_keeps_query_in_pagination_links(
+        client, search_backend, mixer: Mixer, user, published_category):
+    mixer.cycle(12).blend(
+        "blog.Post", author=user, category=published_category,
+        location=None, title="Байкал",
+    )
+    content = client.get("/search/", {"q": "байкал"}).content.decode()
+    assert "?q=%D0%B1%D0%B0%D0%B9%D0%BA%D0%B0%D0%BB&amp;page=2" in content
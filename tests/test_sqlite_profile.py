@@ -0,0 +1,48 @@
+import pytest
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+pytestmark = [pytest.mark.django_db]
+
+PRODUCTION_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "mmap_size": 1024 * 1024,
+    "cache_size": -1024,
+    "busy_timeout": 5000,
+}
+
+
+def _pragmas(tmp_path, *names):
+    wrapper = DatabaseWrapper(
+        {**connection.settings_dict, "NAME": str(tmp_path / "db.sqlite3")},
+        alias="profile",
+    )
+    try:
+        with wrapper.cursor() as cursor:
+            return {
+                name: cursor.execute(f"PRAGMA {name}").fetchone()[0]
+                for name in names
+            }
+    finally:
+        wrapper.close()
+
+
+def test_new_connections_get_pragmas(settings, tmp_path):
+    settings.SQLITE_PRAGMAS = PRODUCTION_PRAGMAS
+    assert _pragmas(
+        tmp_path, "journal_mode", "synchronous", "busy_timeout", "cache_size"
+    ) == {
+        "journal_mode": "wal",
+        "synchronous": 1,
+        "busy_timeout": 5000,
+        "cache_size": -1024,
+    }, (
+        "Убедитесь, что PRAGMA из SQLITE_PRAGMAS выполняются для каждого"
+        " нового соединения SQLite."
+    )
+
+
+def test_default_profile_keeps_sqlite_defaults(settings, tmp_path):
+    settings.SQLITE_PRAGMAS = {}
+    assert _pragmas(tmp_path, "journal_mode") == {"journal_mode": "delete"}
@@ -0,0 +1,86 @@
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from PIL import Image
+
+from blog import tasks
+from blog.thumbnails import thumbnail_name
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _image_upload(size=(2000, 1500)):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    buffer = BytesIO()
+    Image.new("RGB", size, color=(73, 109, 137)).save(buffer, "JPEG")
+    return SimpleUploadedFile(
+        "big.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+
+@override_settings(JOBS_EAGER=True)
+def test_thumbnails_generated_on_create(
+        user, user_client, published_category, published_location,
+        PostModel):
+    response = user_client.post("/posts/create/", {
+        "title": "С картинкой",
+        "text": "Текст",
+        "pub_date": "2020-01-01T10:00",
+        "category": published_category.id,
+        "location": published_location.id,
+        "image": _image_upload(),
+    })
+    assert response.status_code == 302
+    post = PostModel.objects.get(title="С картинкой")
+    storage = post.image.storage
+    card_name = thumbnail_name(post.image.name, "card")
+    assert storage.exists(card_name), (
+        "Убедитесь, что при создании публикации создаются уменьшенные копии"
+        " изображения."
+    )
+    with storage.open(card_name) as thumb:
+        image = Image.open(thumb)
+        assert image.format == "WEBP"
+        assert max(image.size) <= 640
+
+    content = user_client.get(f"/profile/{user.username}/").content.decode()
+    assert storage.url(card_name) in content, (
+        "Убедитесь, что в ленте выводится уменьшенная копия изображения."
+    )
+
+
+def test_generate_thumbnails_command(post_with_published_location):
+    post = post_with_published_location
+    image = post.image
+    assert not image.storage.exists(thumbnail_name(image.name, "card"))
+    call_command("generate_thumbnails", stdout=StringIO())
+    assert image.storage.exists(thumbnail_name(image.name, "card"))
+    assert image.storage.exists(thumbnail_name(image.name, "detail"))
+    updated_at = post.updated_at
+    post.refresh_from_db()
+    assert post.updated_at > updated_at, (
+        "Убедитесь, что `generate_thumbnails` обновляет updated_at поста,"
+        " чтобы закешированная карточка показала уменьшенную копию."
+    )
+
+
+def test_processing_keeps_image_replaced_meanwhile(
+        monkeypatch, PostModel, post_with_published_location):
+    post = post_with_published_location
+    PostModel.objects.filter(pk=post.pk).update(image_processing=True)
+    normalize = tasks.normalize_image
+
+    def replace_during_processing(image):
+        PostModel.objects.filter(pk=post.pk).update(image="posts/new.jpg")
+        return normalize(image)
+
+    monkeypatch.setattr(tasks, "normalize_image", replace_during_processing)
+    tasks.process_post_image(post.pk)
+    post.refresh_from_db()
+    assert post.image.name == "posts/new.jpg", (
+        "Убедитесь, что обработка изображения не затирает картинку,"
+        " которую автор успел заменить."
+    )
+    assert post.image_processing